@@ -3,11 +3,13 @@ Configuration module for DART analysis system.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Load environment variables, unless the deployment already sets them
+if os.getenv("DART_API") is None:
+    load_dotenv()
 
 # Project paths
 PROJECT_ROOT = Path(__file__).parent
@@ -16,9 +18,23 @@ RAW_DATA_DIR = DATA_DIR / "raw"
 PROCESSED_DATA_DIR = DATA_DIR / "processed"
 CACHE_DIR = DATA_DIR / "cache"
 
-# Create directories if not exist
-for dir_path in [DATA_DIR, RAW_DATA_DIR, PROCESSED_DATA_DIR, CACHE_DIR]:
+
+@lru_cache(maxsize=None)
+def ensure_dir(dir_path: Path) -> Path:
+    """
+    Create a data directory on first use.
+
+    Call this where files are written; reads check for the file instead.
+
+    Args:
+        dir_path: Directory to create
+
+    Returns:
+        The same directory path
+    """
     dir_path.mkdir(exist_ok=True, parents=True)
+    return dir_path
+
 
 # DART API Configuration
 DART_API_KEY = os.getenv("DART_API")
@@ -35,14 +51,14 @@ ENDPOINTS = {
 }
 
 # Classification settings
-COSMETIC_KSIC_CODES = [
+COSMETIC_KSIC_CODES = frozenset({
     'C20423',  # 화장품 제조업
     'C20412',  # 기타 기초 유기화학물질 제조업
     'C20411',  # 석유화학계 기초화합물 제조업
     'C20421',  # 비누 및 세제 제조업
     'C20422',  # 화장용 유지류 제조업
     'C20429',  # 기타 화장품 제조업
-]
+})
 
 CLASSIFICATION_KEYWORDS = {
     'high_priority': ['화장품원료', '화장품 원료', 'cosmetic ingredient', '기능성원료', '기능성 원료'],
@@ -67,14 +83,23 @@ FINANCIAL_REPORT_CODES = {
 }
 
 # Financial metrics to collect
-FINANCIAL_METRICS = [
+FINANCIAL_METRICS = (
     '매출액',
     '영업이익',
     '당기순이익',
     '자산총계',
     '부채총계',
     '자본총계',
-]
+)
+
+# Columns averaged per year for the industry benchmark
+INDUSTRY_METRIC_COLS = FINANCIAL_METRICS + (
+    '영업이익률', '순이익률', '부채비율',
+    '매출액_성장률', '영업이익_성장률', '당기순이익_성장률',
+)
+
+# Compute engine: calculate dashboard metrics with Polars (optional dependency)
+USE_POLARS = False
 
 # Cache settings
 COMPANY_CACHE_TTL = 86400  # 24 hours
@@ -82,9 +107,11 @@ FINANCIAL_CACHE_TTL = 604800  # 7 days
 
 # API rate limiting
 API_RATE_LIMIT = 10  # requests per second
+API_MAX_WORKERS = 8  # concurrent API requests
+HTTP_POOL_SIZE = 32  # pooled keep-alive connections per host
 API_RETRY_COUNT = 3
 API_TIMEOUT = 60  # seconds (increased for large file downloads)
-RETRY_DELAY = 5  # seconds
+RETRY_DELAY = 5  # seconds, backoff factor between retries
 
 # Logging
 LOG_LEVEL = "INFO"
@@ -3,12 +3,11 @@ Company Overview page - Shows classified companies and basic statistics.
 """
 
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
 import config
-from src.data_processor import DataProcessor
+from src.app_cache import csv_bytes, export_frames, get_dashboard_data, get_processor
 
 # Page configuration
 st.set_page_config(
@@ -17,12 +16,15 @@ st.set_page_config(
     layout="wide"
 )
 
-# Load data
-@st.cache_data(ttl=3600)
-def load_companies_data():
-    """Load companies data with caching."""
-    processor = DataProcessor()
-    return processor.prepare_dashboard_data()
+# Export data
+@st.cache_data(show_spinner=False)
+def load_companies_csv(data_version: int) -> bytes:
+    """
+    Encode the companies list as CSV, without the dashboard's listing columns.
+
+    data_version is get_dashboard_data()['version'], so new data gets new entries.
+    """
+    return csv_bytes(export_frames(get_dashboard_data())['companies'])
 
 # Main page
 def main():
@@ -31,7 +33,7 @@ def main():
     st.markdown("---")
 
     try:
-        data = load_companies_data()
+        data = get_dashboard_data()
         companies_df = data['companies']
         metrics_df = data['metrics']
 
@@ -50,7 +52,7 @@ def main():
 
         with col2:
             if 'stock_code' in companies_df.columns:
-                listed_companies = companies_df[companies_df['stock_code'].notna() & (companies_df['stock_code'] != '')].shape[0]
+                listed_companies = int(companies_df['is_listed'].sum())
                 st.metric("상장 회사", f"{listed_companies}개")
             else:
                 st.metric("상장 회사", "N/A")
@@ -61,13 +63,7 @@ def main():
         st.subheader("시장 분포")
 
         if 'stock_code' in companies_df.columns:
-            # Determine market type
-            companies_df_copy = companies_df.copy()
-            companies_df_copy['market_type'] = companies_df_copy['stock_code'].apply(
-                lambda x: '상장' if pd.notna(x) and x.strip() != '' else '비상장'
-            )
-
-            market_counts = companies_df_copy['market_type'].value_counts()
+            market_counts = companies_df['market_type'].value_counts()
 
             fig_market = px.pie(
                 values=market_counts.values,
@@ -99,18 +95,20 @@ def main():
         if search_method == "직접 입력":
             search_query = st.text_input("회사명 검색 (부분 검색 가능)", "", placeholder="예: 코스맥스")
         else:
-            search_query = st.selectbox(
+            # None stands for "전체" (no filter)
+            selected_name = st.selectbox(
                 "회사 선택 (입력하여 검색 가능)",
-                options=["전체"] + sorted(companies_df['corp_name'].unique().tolist()),
+                options=[None] + data['company_names'],
+                format_func=lambda x: "전체" if x is None else x,
                 index=0
             )
-            if search_query == "전체":
-                search_query = ""
+            search_query = selected_name or ""
 
         if search_query:
-            df_display = companies_df[companies_df['corp_name'].str.contains(search_query, case=False, na=False)]
+            mask = companies_df['corp_name'].str.contains(search_query, case=False, regex=False, na=False)
+            df_display = companies_df[mask]
         else:
-            df_display = companies_df.copy()
+            df_display = companies_df
 
         # Show detailed info if only one company is selected
         if len(df_display) == 1:
@@ -125,9 +123,8 @@ def main():
                 st.metric("회사명", company_row.get('corp_name', 'N/A'))
 
             with col2:
-                stock_code = company_row.get('stock_code', '')
-                if pd.notna(stock_code) and stock_code.strip() != '':
-                    st.metric("종목코드", stock_code)
+                if company_row.get('is_listed', False):
+                    st.metric("종목코드", company_row['stock_code'])
                 else:
                     st.metric("종목코드", "비상장")
 
@@ -175,14 +172,14 @@ def main():
             }.get(x, x)
         )
 
-        if sort_col in df_display.columns:
-            df_display = df_display.sort_values(by=sort_col, ascending=False)
-
-        # Display table
+        # Display table (sort only the displayed columns)
         display_cols = ['corp_name', 'stock_code', 'corp_code']
         display_cols = [col for col in display_cols if col in df_display.columns]
 
-        df_table = df_display[display_cols].copy()
+        df_table = df_display[display_cols]
+        if sort_col in df_table.columns:
+            df_table = df_table.sort_values(by=sort_col, ascending=False)
+
         df_table = df_table.rename(columns={
             'corp_name': '회사명',
             'stock_code': '종목코드',
@@ -199,19 +196,18 @@ def main():
         col1, col2 = st.columns(2)
 
         with col1:
-            csv = companies_df.to_csv(index=False, encoding='utf-8-sig')
             st.download_button(
                 label="CSV 다운로드",
-                data=csv,
+                data=load_companies_csv(data['version']),
                 file_name="cosmetic_companies.csv",
                 mime="text/csv"
             )
 
         with col2:
             if st.button("Excel 내보내기"):
-                processor = DataProcessor()
-                output_path = config.PROCESSED_DATA_DIR / "cosmetic_analysis.xlsx"
-                processor.export_to_excel(output_path)
+                output_path = config.ensure_dir(config.PROCESSED_DATA_DIR) / "cosmetic_analysis.xlsx"
+                # Export the snapshot shown on this page
+                get_processor().export_to_excel(output_path, data=export_frames(data))
                 st.success(f"Excel 파일이 저장되었습니다: {output_path}")
 
     except Exception as e:
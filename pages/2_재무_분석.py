@@ -6,10 +6,12 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from plotly.colors import qualitative
+from plotly.subplots import make_subplots
 import numpy as np
 
 import config
-from src.data_processor import DataProcessor
+from src.app_cache import csv_bytes, get_dashboard_data
 
 # Page configuration
 st.set_page_config(
@@ -18,12 +20,81 @@ st.set_page_config(
     layout="wide"
 )
 
-# Load data
-@st.cache_data(ttl=3600)
-def load_analysis_data():
-    """Load analysis data with caching."""
-    processor = DataProcessor()
-    return processor.prepare_dashboard_data()
+# Heatmap data per selection
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_heatmap_data(data_version: int, companies: tuple, year_from: int, year_to: int) -> pd.DataFrame:
+    """
+    Reshape operating margins into a company x year grid with caching.
+
+    data_version is get_dashboard_data()['version'], so new data gets new entries.
+    """
+    metrics_indexed = get_dashboard_data()['metrics_indexed']
+    return metrics_indexed.loc[
+        (list(companies), slice(year_from, year_to)), '영업이익률'
+    ].unstack('year')
+
+# Trend charts
+TREND_PANELS = [
+    ('매출액_억원', '매출액 추이', '매출액 (억원)'),
+    ('영업이익_억원', '영업이익 추이', '영업이익 (억원)'),
+]
+MARGIN_PANELS = [
+    ('영업이익률', '영업이익률 추이', '영업이익률 (%)'),
+    ('순이익률', '순이익률 추이', '순이익률 (%)'),
+]
+
+def make_trend_figures(df: pd.DataFrame, panel_groups: list) -> list:
+    """
+    Build one side-by-side line chart figure per panel group.
+
+    The data is grouped by company once and each company's traces are
+    added to every figure in the same pass.
+
+    Args:
+        df: Filtered metrics data
+        panel_groups: List of panel lists, each panel a (column, title, y-axis label) tuple
+
+    Returns:
+        List of Plotly figures, None for groups with no available columns
+    """
+    colors = qualitative.Plotly
+    panel_groups = [
+        [panel for panel in panels if panel[0] in df.columns]
+        for panels in panel_groups
+    ]
+    figures = [
+        make_subplots(rows=1, cols=len(panels), subplot_titles=[title for _, title, _ in panels])
+        if panels else None
+        for panels in panel_groups
+    ]
+
+    for i, (corp_name, df_company) in enumerate(df.groupby('corp_name', sort=False, observed=True)):
+        color = colors[i % len(colors)]
+        years = df_company['year'].to_numpy()
+        for fig, panels in zip(figures, panel_groups):
+            for col, (column, _, _) in enumerate(panels, start=1):
+                fig.add_trace(
+                    go.Scatter(
+                        x=years,
+                        y=df_company[column].to_numpy(),
+                        mode='lines+markers',
+                        name=corp_name,
+                        legendgroup=corp_name,
+                        showlegend=(col == 1),
+                        line=dict(color=color)
+                    ),
+                    row=1, col=col
+                )
+
+    for fig, panels in zip(figures, panel_groups):
+        if fig is None:
+            continue
+        for col, (_, _, y_label) in enumerate(panels, start=1):
+            fig.update_yaxes(title_text=y_label, row=1, col=col)
+        fig.update_xaxes(title_text='연도')
+        fig.update_layout(hovermode='x unified', height=400, legend_title_text='회사명')
+
+    return figures
 
 # Main page
 def main():
@@ -32,7 +103,7 @@ def main():
     st.markdown("---")
 
     try:
-        data = load_analysis_data()
+        data = get_dashboard_data()
         companies_df = data['companies']
         metrics_df = data['metrics']
         industry_avg_df = data['industry_avg']
@@ -46,7 +117,7 @@ def main():
         st.sidebar.markdown("---")
 
         # Company search and selection
-        available_companies = sorted(metrics_df['corp_name'].unique())
+        available_companies = data['metric_company_names']
 
         # Search mode selector
         search_mode = st.sidebar.radio(
@@ -69,9 +140,8 @@ def main():
             if not company_info.empty:
                 st.sidebar.markdown("---")
                 st.sidebar.markdown("**선택된 회사 정보**")
-                stock_code = company_info.iloc[0].get('stock_code', '')
-                if pd.notna(stock_code) and stock_code.strip() != '':
-                    stock_display = stock_code
+                if company_info.iloc[0].get('is_listed', False):
+                    stock_display = company_info.iloc[0]['stock_code']
                 else:
                     stock_display = '비상장'
                 st.sidebar.info(f"""
@@ -95,20 +165,21 @@ def main():
         st.sidebar.markdown("---")
 
         # Year range
-        available_years = sorted(metrics_df['year'].unique())
+        available_years = data['years']
         year_range = st.sidebar.slider(
             "연도 범위",
-            min_value=int(min(available_years)),
-            max_value=int(max(available_years)),
-            value=(int(min(available_years)), int(max(available_years)))
+            min_value=available_years[0],
+            max_value=available_years[-1],
+            value=(available_years[0], available_years[-1])
         )
 
         # Filter data
-        df_filtered = metrics_df[
-            (metrics_df['year'] >= year_range[0]) &
-            (metrics_df['year'] <= year_range[1]) &
-            (metrics_df['corp_name'].isin(selected_companies))
-        ]
+        df_filtered = data['metrics_indexed'].loc[
+            (selected_companies, slice(year_range[0], year_range[1])), :
+        ].reset_index()
+        # Plotly Express groups by color with observed=False; drop the
+        # categories of companies that are not selected
+        df_filtered['corp_name'] = df_filtered['corp_name'].cat.remove_unused_categories()
 
         if df_filtered.empty:
             st.warning("선택한 필터에 해당하는 데이터가 없습니다.")
@@ -118,45 +189,12 @@ def main():
         st.header("1. 매출/영업이익 트렌드 분석")
         st.markdown("연도별 매출액과 영업이익 추이를 확인합니다.")
 
-        col1, col2 = st.columns(2)
-
-        with col1:
-            if '매출액' in df_filtered.columns:
-                df_chart = df_filtered.copy()
-                df_chart['매출액_억원'] = df_chart['매출액'] / 100000000
-
-                fig_revenue = px.line(
-                    df_chart,
-                    x='year',
-                    y='매출액_억원',
-                    color='corp_name',
-                    markers=True,
-                    labels={'매출액_억원': '매출액 (억원)', 'year': '연도', 'corp_name': '회사명'},
-                    title='매출액 추이'
-                )
-                fig_revenue.update_layout(hovermode='x unified', height=400)
-                st.plotly_chart(fig_revenue, use_container_width=True)
-            else:
-                st.info("매출액 데이터가 없습니다.")
-
-        with col2:
-            if '영업이익' in df_filtered.columns:
-                df_chart = df_filtered.copy()
-                df_chart['영업이익_억원'] = df_chart['영업이익'] / 100000000
-
-                fig_profit = px.line(
-                    df_chart,
-                    x='year',
-                    y='영업이익_억원',
-                    color='corp_name',
-                    markers=True,
-                    labels={'영업이익_억원': '영업이익 (억원)', 'year': '연도', 'corp_name': '회사명'},
-                    title='영업이익 추이'
-                )
-                fig_profit.update_layout(hovermode='x unified', height=400)
-                st.plotly_chart(fig_profit, use_container_width=True)
-            else:
-                st.info("영업이익 데이터가 없습니다.")
+        fig_trend, fig_margin = make_trend_figures(df_filtered, [TREND_PANELS, MARGIN_PANELS])
+
+        if fig_trend is not None:
+            st.plotly_chart(fig_trend, use_container_width=True)
+        else:
+            st.info("매출액/영업이익 데이터가 없습니다.")
 
         # Growth rates
         st.subheader("성장률 분석")
@@ -182,50 +220,16 @@ def main():
         st.header("2. 수익성 지표 분석")
         st.markdown("영업이익률과 순이익률을 통해 수익성을 평가합니다.")
 
-        col1, col2 = st.columns(2)
-
-        with col1:
-            if '영업이익률' in df_filtered.columns:
-                fig_op_margin = px.line(
-                    df_filtered,
-                    x='year',
-                    y='영업이익률',
-                    color='corp_name',
-                    markers=True,
-                    labels={'영업이익률': '영업이익률 (%)', 'year': '연도', 'corp_name': '회사명'},
-                    title='영업이익률 추이'
-                )
-                fig_op_margin.update_layout(hovermode='x unified', height=400)
-                st.plotly_chart(fig_op_margin, use_container_width=True)
-            else:
-                st.info("영업이익률 데이터가 없습니다.")
-
-        with col2:
-            if '순이익률' in df_filtered.columns:
-                fig_net_margin = px.line(
-                    df_filtered,
-                    x='year',
-                    y='순이익률',
-                    color='corp_name',
-                    markers=True,
-                    labels={'순이익률': '순이익률 (%)', 'year': '연도', 'corp_name': '회사명'},
-                    title='순이익률 추이'
-                )
-                fig_net_margin.update_layout(hovermode='x unified', height=400)
-                st.plotly_chart(fig_net_margin, use_container_width=True)
-            else:
-                st.info("순이익률 데이터가 없습니다.")
+        if fig_margin is not None:
+            st.plotly_chart(fig_margin, use_container_width=True)
+        else:
+            st.info("수익률 데이터가 없습니다.")
 
         # Profitability heatmap
         st.subheader("수익성 히트맵")
 
         if '영업이익률' in df_filtered.columns:
-            # Pivot data for heatmap
-            df_heatmap = df_filtered.pivot(
-                index='corp_name',
-                columns='year',
-                values='영업이익률'
-            )
+            df_heatmap = load_heatmap_data(data['version'], tuple(selected_companies), *year_range)
 
             fig_heatmap = px.imshow(
                 df_heatmap,
@@ -248,34 +252,38 @@ def main():
         if not industry_avg_df.empty:
             # Combine company data with industry average
             latest_year = df_filtered['year'].max()
-            df_latest = df_filtered[df_filtered['year'] == latest_year].copy()
-            df_industry_latest = industry_avg_df[industry_avg_df['year'] == latest_year].copy()
+            df_latest = df_filtered[df_filtered['year'] == latest_year]
+            df_industry_latest = industry_avg_df[industry_avg_df['year'] == latest_year]
 
             # Revenue comparison
             if '매출액' in df_latest.columns and '매출액' in df_industry_latest.columns:
                 st.subheader(f"매출액 비교 ({latest_year}년)")
 
-                df_comparison = df_latest[['corp_name', '매출액']].copy()
-                df_comparison['매출액_억원'] = df_comparison['매출액'] / 100000000
-
-                # Add industry average
+                # Company bars plus an industry average bar
                 industry_avg_revenue = df_industry_latest['매출액'].iloc[0] / 100000000
-                df_avg_row = pd.DataFrame([{
-                    'corp_name': '산업 평균',
-                    '매출액_억원': industry_avg_revenue
-                }])
-                df_comparison = pd.concat([df_comparison, df_avg_row], ignore_index=True)
-
-                fig_revenue_comp = px.bar(
-                    df_comparison,
-                    x='corp_name',
-                    y='매출액_억원',
-                    labels={'매출액_억원': '매출액 (억원)', 'corp_name': '회사명'},
+
+                fig_revenue_comp = go.Figure()
+                fig_revenue_comp.add_bar(
+                    x=df_latest['corp_name'], y=df_latest['매출액_억원'],
+                    name='회사', marker_color='steelblue'
+                )
+                fig_revenue_comp.add_bar(
+                    x=['산업 평균'], y=[industry_avg_revenue],
+                    name='산업 평균', marker_color='orange'
+                )
+                fig_revenue_comp.update_layout(
                     title=f'{latest_year}년 매출액 vs 산업 평균',
-                    color_discrete_sequence=['steelblue'] * (len(df_comparison) - 1) + ['orange']
+                    xaxis_title='회사명',
+                    yaxis_title='매출액 (억원)',
+                    barmode='overlay',
+                    showlegend=False
                 )
                 st.plotly_chart(fig_revenue_comp, use_container_width=True)
 
+            # Sort once by operating margin for the comparison and ranking views
+            if '영업이익률' in df_latest.columns:
+                sorted_latest = df_latest[['corp_name', '영업이익률']].dropna().sort_values('영업이익률')
+
             # Profitability comparison
             if '영업이익률' in df_latest.columns and '영업이익률' in df_industry_latest.columns:
                 st.subheader(f"수익성 비교 ({latest_year}년)")
@@ -283,29 +291,31 @@ def main():
                 col1, col2 = st.columns(2)
 
                 with col1:
-                    df_op_comp = df_latest[['corp_name', '영업이익률']].copy()
                     industry_avg_op = df_industry_latest['영업이익률'].iloc[0]
 
-                    df_op_avg = pd.DataFrame([{
-                        'corp_name': '산업 평균',
-                        '영업이익률': industry_avg_op
-                    }])
-                    df_op_comp = pd.concat([df_op_comp, df_op_avg], ignore_index=True)
-
-                    fig_op_comp = px.bar(
-                        df_op_comp,
-                        x='corp_name',
-                        y='영업이익률',
-                        labels={'영업이익률': '영업이익률 (%)', 'corp_name': '회사명'},
+                    fig_op_comp = go.Figure()
+                    fig_op_comp.add_bar(
+                        x=df_latest['corp_name'], y=df_latest['영업이익률'],
+                        name='회사', marker_color='teal'
+                    )
+                    fig_op_comp.add_bar(
+                        x=['산업 평균'], y=[industry_avg_op],
+                        name='산업 평균', marker_color='orange'
+                    )
+                    fig_op_comp.update_layout(
                         title=f'{latest_year}년 영업이익률 vs 산업 평균',
-                        color_discrete_sequence=['teal'] * (len(df_op_comp) - 1) + ['orange']
+                        xaxis_title='회사명',
+                        yaxis_title='영업이익률 (%)',
+                        barmode='overlay',
+                        showlegend=False
                     )
                     st.plotly_chart(fig_op_comp, use_container_width=True)
 
                 with col2:
                     # Calculate deviation from industry average
-                    df_deviation = df_latest[['corp_name', '영업이익률']].copy()
-                    df_deviation['산업평균대비'] = df_deviation['영업이익률'] - industry_avg_op
+                    df_deviation = sorted_latest.assign(
+                        산업평균대비=sorted_latest['영업이익률'].to_numpy() - industry_avg_op
+                    )
 
                     fig_deviation = px.bar(
                         df_deviation,
@@ -326,13 +336,13 @@ def main():
 
             with col1:
                 if '영업이익률' in df_latest.columns:
-                    top_5 = df_latest.nlargest(5, '영업이익률')[['corp_name', '영업이익률']]
+                    top_5 = sorted_latest.tail(5).iloc[::-1]
                     st.markdown("**영업이익률 상위 5개사**")
                     st.dataframe(top_5, use_container_width=True)
 
             with col2:
                 if '영업이익률' in df_latest.columns:
-                    bottom_5 = df_latest.nsmallest(5, '영업이익률')[['corp_name', '영업이익률']]
+                    bottom_5 = sorted_latest.head(5)
                     st.markdown("**영업이익률 하위 5개사**")
                     st.dataframe(bottom_5, use_container_width=True)
 
@@ -346,27 +356,21 @@ def main():
 
         if not df_filtered.empty:
             # Select display columns
-            display_cols = ['corp_name', 'year', '매출액', '영업이익', '당기순이익',
+            display_cols = ['corp_name', 'year', '매출액_억원', '영업이익_억원', '당기순이익_억원',
                            '영업이익률', '순이익률', '매출액_성장률']
             display_cols = [col for col in display_cols if col in df_filtered.columns]
 
-            df_display = df_filtered[display_cols].copy()
-
-            # Format numbers
-            if '매출액' in df_display.columns:
-                df_display['매출액'] = (df_display['매출액'] / 100000000).round(0)
-            if '영업이익' in df_display.columns:
-                df_display['영업이익'] = (df_display['영업이익'] / 100000000).round(0)
-            if '당기순이익' in df_display.columns:
-                df_display['당기순이익'] = (df_display['당기순이익'] / 100000000).round(0)
-
-            # Rename columns
-            df_display = df_display.rename(columns={
+            # Round amounts and rename columns
+            df_display = df_filtered[display_cols].round({
+                '매출액_억원': 0,
+                '영업이익_억원': 0,
+                '당기순이익_억원': 0
+            }).rename(columns={
                 'corp_name': '회사명',
                 'year': '연도',
-                '매출액': '매출액 (억원)',
-                '영업이익': '영업이익 (억원)',
-                '당기순이익': '당기순이익 (억원)',
+                '매출액_억원': '매출액 (억원)',
+                '영업이익_억원': '영업이익 (억원)',
+                '당기순이익_억원': '당기순이익 (억원)',
                 '영업이익률': '영업이익률 (%)',
                 '순이익률': '순이익률 (%)',
                 '매출액_성장률': '매출 성장률 (%)'
@@ -375,10 +379,9 @@ def main():
             st.dataframe(df_display, use_container_width=True, height=400)
 
             # Download button
-            csv = df_display.to_csv(index=False, encoding='utf-8-sig')
             st.download_button(
                 label="데이터 CSV 다운로드",
-                data=csv,
+                data=csv_bytes(df_display),
                 file_name="financial_analysis.csv",
                 mime="text/csv"
             )
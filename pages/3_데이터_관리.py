@@ -2,15 +2,24 @@
 Data Management page - Company search and financial data collection.
 """
 
+import codecs
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 import streamlit as st
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 import config
 from src.dart_client import DartClient
-from src.financial_collector import FinancialCollector
-from src.data_processor import DataProcessor
+from src.financial_collector import FinancialCollector, migrate_financial_csv
+from src.app_cache import get_dashboard_data, get_processor
+from src.cache_io import api_cache
 
 # Page configuration
 st.set_page_config(
@@ -19,6 +28,299 @@ st.set_page_config(
     layout="wide"
 )
 
+# Cached loaders
+@st.cache_resource
+def get_dart_client(api_key: str) -> DartClient:
+    """Return the DART client shared by all sessions."""
+    return DartClient(api_key)
+
+@st.cache_resource
+def get_collector(api_key: str) -> FinancialCollector:
+    """Return the financial collector shared by all sessions."""
+    return FinancialCollector(get_dart_client(api_key))
+
+def build_trigram_index(names: pd.Series) -> Dict[str, np.ndarray]:
+    """
+    Build an inverted index from character trigrams to row positions.
+
+    Args:
+        names: Lowercased company names
+
+    Returns:
+        Dictionary of trigram to sorted row positions containing it
+    """
+    postings = defaultdict(list)
+    for position, name in enumerate(names.fillna('')):
+        for trigram in {name[k:k + 3] for k in range(len(name) - 2)}:
+            postings[trigram].append(position)
+    return {trigram: np.array(positions, dtype=np.int32) for trigram, positions in postings.items()}
+
+def build_corp_search(dart_client: DartClient) -> Tuple[pd.DataFrame, Dict[str, np.ndarray]]:
+    """
+    Fetch the full DART company list and index it for searching.
+
+    Args:
+        dart_client: DART API client
+
+    Returns:
+        Tuple of (companies DataFrame with a lowercased '_lname' column,
+        trigram index over '_lname')
+    """
+    corp_df = pd.DataFrame(dart_client.get_corp_codes())
+    if corp_df.empty:
+        return corp_df, {}
+
+    # Arrow strings convert to Arrow tables for st.dataframe without copying
+    corp_df = corp_df.astype({
+        col: 'string[pyarrow]' for col in ('corp_code', 'corp_name', 'stock_code')
+        if col in corp_df.columns
+    })
+    corp_df['_lname'] = corp_df['corp_name'].str.lower()
+    return corp_df, build_trigram_index(corp_df['_lname'])
+
+def search_companies(corp_df: pd.DataFrame, trigram_index: Dict[str, np.ndarray], query: str) -> pd.DataFrame:
+    """
+    Find companies whose name contains the query, ignoring case.
+
+    Queries of three or more characters intersect the trigram posting
+    lists and check only those candidates; shorter queries scan all names.
+
+    Args:
+        corp_df: Companies from build_corp_search()
+        trigram_index: Trigram index from build_corp_search()
+        query: Search text
+
+    Returns:
+        Matching rows of corp_df in their original order
+    """
+    query = query.lower()
+    if len(query) < 3:
+        return corp_df.loc[corp_df['_lname'].str.contains(query, regex=False, na=False)]
+
+    postings = []
+    for trigram in {query[k:k + 3] for k in range(len(query) - 2)}:
+        if trigram not in trigram_index:
+            return corp_df.iloc[:0]
+        postings.append(trigram_index[trigram])
+
+    # Intersect starting from the shortest list
+    postings.sort(key=len)
+    candidates = postings[0]
+    for positions in postings[1:]:
+        candidates = np.intersect1d(candidates, positions, assume_unique=True)
+
+    df_candidates = corp_df.iloc[candidates]
+    return df_candidates.loc[df_candidates['_lname'].str.contains(query, regex=False, na=False)]
+
+@st.cache_resource
+def get_prefetch_executor() -> ThreadPoolExecutor:
+    """Return the background thread used to prefetch the company list."""
+    return ThreadPoolExecutor(max_workers=1)
+
+@st.cache_resource(ttl=config.COMPANY_CACHE_TTL)
+def prefetch_corp_search(api_key: str, _dart_client: DartClient) -> Future:
+    """
+    Start fetching and indexing the company list in the background, at most once per TTL.
+
+    The future is shared by all sessions; callers must not mutate its result.
+    The client is resolved on the script thread, since the worker thread
+    cannot use Streamlit's caches.
+
+    Args:
+        api_key: DART API key, the cache key
+        _dart_client: DART API client for api_key (not hashed)
+
+    Returns:
+        Future resolving to the build_corp_search() result
+    """
+    return get_prefetch_executor().submit(build_corp_search, _dart_client)
+
+def load_corp_search(api_key: str, dart_client: DartClient) -> Tuple[pd.DataFrame, Dict[str, np.ndarray]]:
+    """
+    Wait for the prefetched company list, fetching again if the prefetch failed.
+
+    A failed or empty result is dropped from the cache, so the next search
+    fetches again instead of reusing it for the whole TTL.
+
+    Args:
+        api_key: DART API key
+        dart_client: DART API client for api_key
+
+    Returns:
+        build_corp_search() result, with an empty DataFrame if fetching failed twice
+    """
+    for attempt in range(2):
+        try:
+            corp_df, trigram_index = prefetch_corp_search(api_key, dart_client).result()
+        except Exception:
+            prefetch_corp_search.clear()
+            if attempt == 1:
+                raise
+            continue
+        if not corp_df.empty:
+            return corp_df, trigram_index
+        prefetch_corp_search.clear()
+    return corp_df, trigram_index
+
+@st.cache_data(show_spinner=False)
+def load_csv(path: str, mtime: float) -> pd.DataFrame:
+    """
+    Read a processed CSV file.
+
+    Args:
+        path: CSV file path
+        mtime: File modification time; part of the cache key so a rewritten file is read again
+
+    Returns:
+        DataFrame with the file contents
+    """
+    return pd.read_csv(path, encoding='utf-8-sig', dtype={'corp_code': str, 'stock_code': str})
+
+def read_csv(path: Path) -> pd.DataFrame:
+    """Read a CSV file through the mtime-keyed cache."""
+    return load_csv(str(path), path.stat().st_mtime)
+
+@st.cache_data(show_spinner=False)
+def load_csv_row_count(path: str, mtime: float) -> int:
+    """
+    Count the data rows of a CSV file without parsing it.
+
+    Args:
+        path: CSV file path
+        mtime: File modification time; part of the cache key
+
+    Returns:
+        Number of lines after the header
+    """
+    lines = 0
+    last = b'\n'
+    with open(path, 'rb') as f:
+        for buf in iter(lambda: f.read(1 << 20), b''):
+            lines += buf.count(b'\n')
+            last = buf[-1:]
+    if last != b'\n':
+        lines += 1  # Last line without a trailing newline
+    return max(lines - 1, 0)
+
+@st.cache_data(show_spinner=False)
+def load_parquet_row_count(path: str, mtime: float) -> int:
+    """
+    Read the row count from a Parquet file footer.
+
+    Args:
+        path: Parquet file path
+        mtime: File modification time; part of the cache key
+
+    Returns:
+        Number of rows
+    """
+    return pq.ParquetFile(path).metadata.num_rows
+
+def file_meta(path: Path) -> Optional[Tuple[float, str]]:
+    """
+    Stat a file once for the cache keys and update time of a section.
+
+    Args:
+        path: File path
+
+    Returns:
+        Tuple of (mtime, formatted update time), or None if the file does not exist
+    """
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    return mtime, datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M')
+
+def write_csv(df: pd.DataFrame, path: Path):
+    """
+    Write a DataFrame as UTF-8 (BOM) CSV with the Arrow CSV writer.
+
+    Args:
+        df: DataFrame to write
+        path: Output file path
+    """
+    with open(path, 'wb') as f:
+        f.write(codecs.BOM_UTF8)  # Excel needs the BOM to detect UTF-8
+        pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), f)
+
+@st.cache_data(show_spinner=False)
+def load_file_bytes(path: str, mtime: float) -> bytes:
+    """
+    Read a file for st.download_button.
+
+    Args:
+        path: File path
+        mtime: File modification time; part of the cache key
+
+    Returns:
+        File contents
+    """
+    return Path(path).read_bytes()
+
+@st.cache_data(show_spinner=False)
+def load_parquet_csv_bytes(path: str, mtime: float) -> bytes:
+    """
+    Convert a Parquet file to UTF-8 (BOM) CSV for st.download_button.
+
+    Args:
+        path: Parquet file path
+        mtime: File modification time; part of the cache key
+
+    Returns:
+        Encoded CSV content
+    """
+    return pd.read_parquet(path, engine='pyarrow').to_csv(index=False).encode('utf-8-sig')
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_excel_bytes(output_path: str, companies_mtime: Optional[float], financial_mtime: Optional[float]) -> bytes:
+    """
+    Export the dashboard workbook and return its content for st.download_button.
+
+    Args:
+        output_path: Excel file path
+        companies_mtime: Selected companies file modification time; part of the cache key
+        financial_mtime: Financial data file modification time; part of the cache key
+
+    Returns:
+        Workbook content
+    """
+    get_processor().export_to_excel(output_path)
+    return Path(output_path).read_bytes()
+
+@st.cache_data(ttl=10, show_spinner=False)
+def cache_stats() -> tuple:
+    """
+    Count the cached API responses and the store size.
+
+    Returns:
+        Tuple of (entry count, total size in MB)
+    """
+    count, size = api_cache.stats()
+    return count, size / 1024 / 1024  # MB
+
+# Tables
+DISPLAY_PAGE_SIZE = 200  # rows sent to the browser per table
+
+def paginate(df: pd.DataFrame, key: str) -> pd.DataFrame:
+    """
+    Return one page of a DataFrame, adding a page selector for long tables.
+
+    Args:
+        df: DataFrame to display
+        key: Widget key for the page selector
+
+    Returns:
+        Rows of the selected page
+    """
+    if len(df) <= DISPLAY_PAGE_SIZE:
+        return df
+
+    num_pages = -(-len(df) // DISPLAY_PAGE_SIZE)
+    page = st.number_input(f"페이지 (총 {num_pages}쪽)", min_value=1, max_value=num_pages, value=1, key=key)
+    start = (page - 1) * DISPLAY_PAGE_SIZE
+    return df.iloc[start:start + DISPLAY_PAGE_SIZE]
+
 # Main page
 def main():
     st.title("⚙️ 데이터 관리")
@@ -27,43 +329,48 @@ def main():
 
     # Initialize DART client
     try:
-        dart_client = DartClient(config.DART_API_KEY)
+        dart_client = get_dart_client(config.DART_API_KEY)
     except ValueError as e:
         st.error(f"API 키 오류: {e}")
         st.info("`.env` 파일에 DART_API 키가 설정되어 있는지 확인해주세요.")
         return
 
+    # Start downloading the company list so it is ready by the first search
+    prefetch_corp_search(config.DART_API_KEY, dart_client)
+
     # Data status section
     st.header("📊 데이터 현황")
 
-    companies_file = config.PROCESSED_DATA_DIR / "selected_companies.csv"
-    financial_file = config.PROCESSED_DATA_DIR / "financial_data.csv"
+    companies_file = config.ensure_dir(config.PROCESSED_DATA_DIR) / "selected_companies.csv"
+    financial_file = config.PROCESSED_DATA_DIR / "financial_data.parquet"
+    migrate_financial_csv(financial_file)
 
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        if companies_file.exists():
-            companies_df = pd.read_csv(companies_file, encoding='utf-8-sig')
-            st.metric("선택된 회사 수", f"{len(companies_df)}개")
-            mod_time = datetime.fromtimestamp(companies_file.stat().st_mtime)
-            st.caption(f"마지막 업데이트: {mod_time.strftime('%Y-%m-%d %H:%M')}")
+        companies_meta = file_meta(companies_file)
+        if companies_meta:
+            num_companies = load_csv_row_count(str(companies_file), companies_meta[0])
+            st.metric("선택된 회사 수", f"{num_companies}개")
+            st.caption(f"마지막 업데이트: {companies_meta[1]}")
         else:
             st.metric("선택된 회사 수", "0개")
             st.caption("데이터 없음")
 
     with col2:
-        if financial_file.exists():
-            financial_df = pd.read_csv(financial_file, encoding='utf-8-sig')
-            st.metric("재무 데이터 레코드", f"{len(financial_df)}개")
-            mod_time = datetime.fromtimestamp(financial_file.stat().st_mtime)
-            st.caption(f"마지막 업데이트: {mod_time.strftime('%Y-%m-%d %H:%M')}")
+        financial_meta = file_meta(financial_file)
+        if financial_meta:
+            # The row count is in the Parquet footer; no need to load the data
+            num_records = load_parquet_row_count(str(financial_file), financial_meta[0])
+            st.metric("재무 데이터 레코드", f"{num_records}개")
+            st.caption(f"마지막 업데이트: {financial_meta[1]}")
         else:
             st.metric("재무 데이터 레코드", "0개")
             st.caption("데이터 없음")
 
     with col3:
-        cache_files = list(config.CACHE_DIR.glob("*.json"))
-        st.metric("캐시 파일 수", f"{len(cache_files)}개")
+        cache_count, cache_size = cache_stats()
+        st.metric("캐시 항목 수", f"{cache_count}개")
 
     st.markdown("---")
 
@@ -90,77 +397,21 @@ def main():
         st.markdown("###")  # Spacing
         search_button = st.button("🔍 검색", use_container_width=True, type="primary")
 
-    # Search results
+    # Search results; kept in session state so the add button survives the rerun it triggers
     if search_button and search_query:
         with st.spinner("회사를 검색하는 중입니다..."):
             try:
                 # Get all company codes
-                corp_codes = dart_client.get_corp_codes()
+                corp_df, trigram_index = load_corp_search(config.DART_API_KEY, dart_client)
 
-                if corp_codes:
+                if not corp_df.empty:
                     # Filter by search query
-                    search_results = [
-                        corp for corp in corp_codes
-                        if search_query.lower() in corp.get('corp_name', '').lower()
-                    ]
-
-                    if search_results:
-                        st.success(f"✅ {len(search_results)}개의 회사를 찾았습니다.")
-
-                        # Display search results
-                        df_results = pd.DataFrame(search_results)
-                        df_results = df_results[['corp_name', 'stock_code', 'corp_code']]
-                        df_results = df_results.rename(columns={
-                            'corp_name': '회사명',
-                            'stock_code': '종목코드',
-                            'corp_code': '회사코드'
-                        })
-
-                        # Show results with selection
-                        st.dataframe(df_results, use_container_width=True)
-
-                        # Allow user to select companies
-                        st.markdown("### 선택할 회사")
-                        selected_indices = st.multiselect(
-                            "추가할 회사를 선택하세요 (여러 개 선택 가능)",
-                            options=range(len(search_results)),
-                            format_func=lambda x: search_results[x]['corp_name']
-                        )
-
-                        if selected_indices and st.button("✅ 선택된 회사 추가", type="primary"):
-                            # Load existing selected companies
-                            if companies_file.exists():
-                                existing_df = pd.read_csv(companies_file, encoding='utf-8-sig')
-                                existing_codes = set(existing_df['corp_code'].tolist())
-                            else:
-                                existing_df = pd.DataFrame()
-                                existing_codes = set()
-
-                            # Add new companies
-                            new_companies = []
-                            for idx in selected_indices:
-                                corp = search_results[idx]
-                                if corp['corp_code'] not in existing_codes:
-                                    new_companies.append({
-                                        'corp_code': corp['corp_code'],
-                                        'corp_name': corp['corp_name'],
-                                        'stock_code': corp.get('stock_code', ''),
-                                    })
-
-                            if new_companies:
-                                new_df = pd.DataFrame(new_companies)
-                                if not existing_df.empty:
-                                    combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-                                else:
-                                    combined_df = new_df
-
-                                combined_df.to_csv(companies_file, index=False, encoding='utf-8-sig')
-                                st.success(f"✅ {len(new_companies)}개 회사가 추가되었습니다!")
-                                st.rerun()
-                            else:
-                                st.info("선택한 회사가 이미 목록에 있습니다.")
+                    df_matches = search_companies(corp_df, trigram_index, search_query)
 
+                    if not df_matches.empty:
+                        st.session_state['search_results'] = df_matches.reset_index(drop=True)
                     else:
+                        st.session_state.pop('search_results', None)
                         st.warning(f"'{search_query}'와 일치하는 회사를 찾을 수 없습니다.")
                 else:
                     st.error("회사 목록을 가져오는데 실패했습니다.")
@@ -168,20 +419,76 @@ def main():
             except Exception as e:
                 st.error(f"검색 중 오류가 발생했습니다: {e}")
 
+    if 'search_results' in st.session_state:
+        search_results = st.session_state['search_results']
+        st.success(f"✅ {len(search_results)}개의 회사를 찾았습니다.")
+
+        # Display search results
+        df_results = search_results[['corp_name', 'stock_code', 'corp_code']].rename(columns={
+            'corp_name': '회사명',
+            'stock_code': '종목코드',
+            'corp_code': '회사코드'
+        })
+
+        # Show results with selection
+        st.dataframe(df_results.head(DISPLAY_PAGE_SIZE), use_container_width=True)
+        if len(df_results) > DISPLAY_PAGE_SIZE:
+            st.caption(f"상위 {DISPLAY_PAGE_SIZE}개만 표시합니다. 검색어를 더 구체적으로 입력해주세요.")
+
+        # Allow user to select companies
+        st.markdown("### 선택할 회사")
+        result_names = search_results['corp_name'].tolist()
+        selected_indices = st.multiselect(
+            "추가할 회사를 선택하세요 (여러 개 선택 가능)",
+            options=range(len(search_results)),
+            format_func=lambda x: result_names[x]
+        )
+
+        col_add, col_reset = st.columns([3, 1])
+
+        with col_add:
+            add_button = st.button("✅ 선택된 회사 추가", type="primary", disabled=not selected_indices)
+
+        with col_reset:
+            if st.button("초기화", use_container_width=True):
+                del st.session_state['search_results']
+                st.rerun()
+
+        if add_button:
+            selected_df = search_results.iloc[selected_indices][['corp_code', 'corp_name', 'stock_code']]
+
+            # Load existing selected companies and drop those already listed
+            existing_df = read_csv(companies_file) if companies_file.exists() else None
+            if existing_df is not None:
+                new_df = selected_df[~selected_df['corp_code'].isin(existing_df['corp_code'])]
+            else:
+                new_df = selected_df.drop_duplicates('corp_code')
+
+            if not new_df.empty:
+                if existing_df is not None:
+                    combined_df = pd.concat([existing_df, new_df], ignore_index=True).drop_duplicates('corp_code')
+                else:
+                    combined_df = new_df
+
+                write_csv(combined_df, companies_file)
+                st.success(f"✅ {len(new_df)}개 회사가 추가되었습니다!")
+                st.rerun()
+            else:
+                st.info("선택한 회사가 이미 목록에 있습니다.")
+
     st.markdown("---")
 
     # Selected companies management
     st.header("📋 선택된 회사 목록")
 
     if companies_file.exists():
-        companies_df = pd.read_csv(companies_file, encoding='utf-8-sig')
+        companies_df = read_csv(companies_file)
 
         if not companies_df.empty:
             st.markdown(f"**총 {len(companies_df)}개 회사 선택됨**")
 
             # Display selected companies
-            display_df = companies_df.copy()
-            display_df = display_df.rename(columns={
+            display_df = paginate(companies_df, key="selected_companies_page").rename(columns={
                 'corp_name': '회사명',
                 'stock_code': '종목코드',
                 'corp_code': '회사코드'
@@ -201,10 +508,11 @@ def main():
             with col2:
                 st.markdown("###")  # Spacing
                 if st.button("❌ 제거", use_container_width=True):
-                    companies_df = companies_df[companies_df['corp_name'] != remove_company]
-                    companies_df.to_csv(companies_file, index=False, encoding='utf-8-sig')
-                    st.success(f"'{remove_company}'가 제거되었습니다.")
-                    st.rerun()
+                    remove_index = companies_df.index[companies_df['corp_name'].to_numpy() == remove_company]
+                    if len(remove_index) > 0:
+                        write_csv(companies_df.drop(index=remove_index), companies_file)
+                        st.success(f"'{remove_company}'가 제거되었습니다.")
+                        st.rerun()
 
             # Collect financial data button
             st.markdown("---")
@@ -212,36 +520,36 @@ def main():
             if st.button("📊 선택된 회사들의 재무 데이터 수집", type="primary", use_container_width=True):
                 with st.spinner("재무 데이터를 수집하는 중입니다... (시간이 걸릴 수 있습니다)"):
                     try:
-                        collector = FinancialCollector(dart_client)
+                        collector = get_collector(config.DART_API_KEY)
 
                         # Create progress bar
                         progress_bar = st.progress(0)
                         status_text = st.empty()
 
-                        all_records = []
-                        total = len(companies_df)
-
-                        for idx, row in companies_df.iterrows():
-                            corp_code = row['corp_code']
-                            corp_name = row['corp_name']
+                        record_counts = {}
 
-                            status_text.text(f"수집 중: {corp_name} ({idx + 1}/{total})")
-                            progress_bar.progress((idx + 1) / total)
+                        def show_progress(done: int, total: int, corp_name: str, num_records: int):
+                            if num_records:
+                                record_counts[corp_name] = record_counts.get(corp_name, 0) + num_records
+                            status_text.text(f"수집 완료: {corp_name} ({done}/{total})")
+                            progress_bar.progress(done / total)
 
-                            records = collector.collect_company_financials(corp_code, corp_name)
-                            all_records.extend(records)
+                        # Collected concurrently and streamed to disk by the collector;
+                        # progress updates run on this thread
+                        df_financial = collector.collect_all(
+                            companies_df, progress_bar=False, on_progress=show_progress
+                        )
 
                         progress_bar.empty()
                         status_text.empty()
 
-                        if all_records:
-                            df_financials = pd.DataFrame(all_records)
-                            df_financials.to_csv(financial_file, index=False, encoding='utf-8-sig')
-
-                            st.success(f"✅ {len(all_records)}개 재무 레코드가 수집되었습니다!")
+                        if not df_financial.empty:
+                            st.success(f"✅ {len(df_financial)}개 재무 레코드가 수집되었습니다!")
 
                             # Show summary
-                            summary = df_financials.groupby('corp_name').size().reset_index(name='레코드 수')
+                            summary = pd.DataFrame(
+                                sorted(record_counts.items()), columns=['corp_name', '레코드 수']
+                            )
                             st.dataframe(summary)
                         else:
                             st.warning("수집된 재무 데이터가 없습니다.")
@@ -264,17 +572,18 @@ def main():
     col1, col2 = st.columns([2, 1])
 
     with col1:
-        cache_files = list(config.CACHE_DIR.glob("*.json"))
-        if cache_files:
-            total_size = sum(f.stat().st_size for f in cache_files) / 1024 / 1024  # MB
-            st.info(f"캐시 파일 {len(cache_files)}개, 총 {total_size:.2f} MB")
+        if cache_count:
+            st.info(f"캐시 항목 {cache_count}개, 총 {cache_size:.2f} MB")
         else:
-            st.info("캐시 파일이 없습니다.")
+            st.info("캐시 항목이 없습니다.")
 
     with col2:
         if st.button("🗑️ 캐시 삭제", type="secondary", use_container_width=True):
             try:
                 dart_client.clear_cache()
+                get_processor().clear_cache()
+                get_dashboard_data.clear()
+                cache_stats.clear()
                 st.success("✅ 캐시가 삭제되었습니다!")
                 st.rerun()
             except Exception as e:
@@ -287,49 +596,53 @@ def main():
 
     col1, col2, col3 = st.columns(3)
 
+    # Stat again: collecting above may have rewritten the files in this run
+    companies_meta = file_meta(companies_file)
+    financial_meta = file_meta(financial_file)
+
     with col1:
-        if companies_file.exists():
-            with open(companies_file, 'rb') as f:
-                st.download_button(
-                    label="회사 목록 CSV",
-                    data=f,
-                    file_name="selected_companies.csv",
-                    mime="text/csv",
-                    use_container_width=True
-                )
+        if companies_meta:
+            st.download_button(
+                label="회사 목록 CSV",
+                data=load_file_bytes(str(companies_file), companies_meta[0]),
+                file_name="selected_companies.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
         else:
             st.button("회사 목록 CSV", disabled=True, use_container_width=True)
 
     with col2:
-        if financial_file.exists():
-            with open(financial_file, 'rb') as f:
-                st.download_button(
-                    label="재무 데이터 CSV",
-                    data=f,
-                    file_name="financial_data.csv",
-                    mime="text/csv",
-                    use_container_width=True
-                )
+        if financial_meta:
+            st.download_button(
+                label="재무 데이터 CSV",
+                data=load_parquet_csv_bytes(str(financial_file), financial_meta[0]),
+                file_name="financial_data.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
         else:
             st.button("재무 데이터 CSV", disabled=True, use_container_width=True)
 
     with col3:
         if st.button("Excel 파일 생성", use_container_width=True):
-            if companies_file.exists() or financial_file.exists():
+            if companies_meta or financial_meta:
                 try:
-                    processor = DataProcessor()
-                    output_path = config.PROCESSED_DATA_DIR / "financial_analysis.xlsx"
-                    processor.export_to_excel(output_path)
+                    output_path = config.ensure_dir(config.PROCESSED_DATA_DIR) / "financial_analysis.xlsx"
+                    excel_bytes = load_excel_bytes(
+                        str(output_path),
+                        companies_meta[0] if companies_meta else None,
+                        financial_meta[0] if financial_meta else None
+                    )
                     st.success(f"✅ Excel 파일이 생성되었습니다!")
 
-                    with open(output_path, 'rb') as f:
-                        st.download_button(
-                            label="Excel 다운로드",
-                            data=f,
-                            file_name="financial_analysis.xlsx",
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                            use_container_width=True
-                        )
+                    st.download_button(
+                        label="Excel 다운로드",
+                        data=excel_bytes,
+                        file_name="financial_analysis.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        use_container_width=True
+                    )
                 except Exception as e:
                     st.error(f"Excel 생성 중 오류: {e}")
             else:
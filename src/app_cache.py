@@ -0,0 +1,151 @@
+"""
+Shared Streamlit cache helpers for the dashboard and its pages.
+"""
+
+import time
+from types import MappingProxyType
+from typing import Dict, Mapping
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.data_processor import DataProcessor
+
+
+def _add_listing_columns(companies_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize stock_code and add listing flags derived from it.
+
+    Args:
+        companies_df: Companies data with a stock_code column
+
+    Returns:
+        Copy of companies_df with a stripped string stock_code and
+        is_listed and market_type columns
+    """
+    companies_df = companies_df.copy()
+    companies_df['stock_code'] = (
+        companies_df['stock_code'].astype('string[pyarrow]').fillna('').str.strip()
+    )
+    companies_df['is_listed'] = (companies_df['stock_code'].str.len() > 0).astype(bool)
+    companies_df['market_type'] = np.where(companies_df['is_listed'], '상장', '비상장')
+    return companies_df
+
+
+def _add_eok_columns(metrics_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add amount columns converted to 억원 for charts and tables.
+
+    Args:
+        metrics_df: DataFrame with calculated metrics
+
+    Returns:
+        Copy of metrics_df with <metric>_억원 columns
+    """
+    metrics_df = metrics_df.copy()
+    for metric in ('매출액', '영업이익', '당기순이익'):
+        if metric in metrics_df.columns:
+            metrics_df[f'{metric}_억원'] = metrics_df[metric].to_numpy() / 100000000
+    return metrics_df
+
+
+@st.cache_resource
+def get_processor() -> DataProcessor:
+    """Return the data processor shared by all pages and sessions."""
+    return DataProcessor()
+
+
+@st.cache_resource(ttl=3600)
+def get_dashboard_data() -> Mapping[str, object]:
+    """
+    Load dashboard data once and share it across pages and sessions.
+
+    The result is cached with st.cache_resource, so every rerun gets the
+    same objects without hashing or copying. The mapping is read-only and
+    callers must ``.copy()`` a frame before mutating it.
+
+    Besides the frames from DataProcessor.prepare_dashboard_data, the
+    dictionary holds 'metrics_indexed' (metrics indexed by corp_name and
+    year) and the sorted 'company_names', 'metric_company_names' and
+    'years' lists. 'version' changes whenever the data is reloaded; pass
+    it to st.cache_data functions that read this mapping so they do not
+    serve old slices. corp_name is categorical in both 'companies' and
+    'metrics', so group by it with observed=True; metrics years are int32.
+
+    Returns:
+        Dictionary of DataFrames and lookup lists for dashboard
+    """
+    data = dict(get_processor().prepare_dashboard_data())
+
+    companies_df = data['companies']
+    if 'stock_code' in companies_df.columns:
+        companies_df = data['companies'] = _add_listing_columns(companies_df)
+
+    metrics_df = data['metrics']
+    if 'corp_name' in companies_df.columns:
+        data['company_names'] = sorted(companies_df['corp_name'].dropna().unique().tolist())
+    else:
+        data['company_names'] = []
+    if not metrics_df.empty:
+        data['metric_company_names'] = sorted(metrics_df['corp_name'].dropna().unique().tolist())
+    else:
+        data['metric_company_names'] = []
+
+    # One categorical dtype for both frames, so filters and groupbys compare
+    # integer codes. .str methods on a categorical run once over the unique
+    # categories and map the result back to the rows.
+    corp_name_dtype = pd.CategoricalDtype(
+        pd.Index(sorted(set(data['company_names']) | set(data['metric_company_names'])),
+                 dtype='string[pyarrow]')
+    )
+    if 'corp_name' in companies_df.columns:
+        companies_df = data['companies'] = companies_df.astype({'corp_name': corp_name_dtype})
+
+    # Index metrics for filtering by company and year range
+    if not metrics_df.empty:
+        metrics_df = _add_eok_columns(metrics_df)
+        # Years fit in int32, half the size of the int64 read from disk
+        metrics_df = data['metrics'] = metrics_df.astype({'corp_name': corp_name_dtype, 'year': 'int32'})
+        data['metrics_indexed'] = metrics_df.set_index(['corp_name', 'year']).sort_index()
+        data['years'] = sorted(int(year) for year in metrics_df['year'].unique())
+    else:
+        data['metrics_indexed'] = pd.DataFrame()
+        data['years'] = []
+
+    data['version'] = time.time_ns()
+    return MappingProxyType(data)
+
+
+def export_frames(data: Mapping[str, object]) -> Dict[str, pd.DataFrame]:
+    """
+    Select the exportable frames of get_dashboard_data(), without the columns it adds.
+
+    Args:
+        data: Mapping returned by get_dashboard_data()
+
+    Returns:
+        Dictionary with the 'companies', 'financial', 'metrics' and
+        'industry_avg' frames of DataProcessor.prepare_dashboard_data()
+    """
+    metrics_df = data['metrics']
+    return {
+        'companies': data['companies'].drop(columns=['is_listed', 'market_type'], errors='ignore'),
+        'financial': data['financial'],
+        'metrics': metrics_df.drop(columns=[col for col in metrics_df.columns if col.endswith('_억원')]),
+        'industry_avg': data['industry_avg'],
+    }
+
+
+@st.cache_data(show_spinner=False)
+def csv_bytes(df: pd.DataFrame) -> bytes:
+    """
+    Encode a DataFrame as UTF-8 (BOM) CSV for st.download_button.
+
+    Args:
+        df: DataFrame to export
+
+    Returns:
+        Encoded CSV content
+    """
+    return df.to_csv(index=False).encode('utf-8-sig')
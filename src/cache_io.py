@@ -0,0 +1,204 @@
+"""
+On-disk caches: a SQLite store for API responses and Parquet files for derived DataFrames.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Tuple
+
+import pandas as pd
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class CacheStore:
+    """
+    Key-value store for cached API responses in a single SQLite file.
+
+    Each thread gets its own connection; WAL mode lets readers run while
+    another thread writes.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Initialize store. The database is created on first use.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            config.ensure_dir(self.path.parent)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, mtime REAL, value BLOB)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, ttl: int) -> Optional[bytes]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+            ttl: Maximum entry age in seconds
+
+        Returns:
+            Stored bytes, or None if missing or expired
+        """
+        row = self._connection().execute(
+            "SELECT value, mtime FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or time.time() - row[1] >= ttl:
+            return None
+        return row[0]
+
+    def set(self, key: str, value: bytes):
+        """
+        Store a value, replacing any previous entry.
+
+        Args:
+            key: Cache key
+            value: Encoded value
+        """
+        self._connection().execute(
+            "INSERT OR REPLACE INTO cache (key, mtime, value) VALUES (?, ?, ?)",
+            (key, time.time(), value)
+        )
+
+    def clear(self) -> int:
+        """
+        Delete all entries.
+
+        Returns:
+            Number of deleted entries
+        """
+        if not self.path.exists():
+            return 0
+        conn = self._connection()
+        deleted = conn.execute("DELETE FROM cache").rowcount
+        # Give the freed pages back to the file system
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return deleted
+
+    def stats(self) -> Tuple[int, int]:
+        """
+        Count entries and their total size.
+
+        Returns:
+            Tuple of (entry count, total value size in bytes)
+        """
+        if not self.path.exists():
+            return 0, 0
+        count, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache"
+        ).fetchone()
+        return count, size
+
+
+# Shared by every DartClient in the process
+api_cache = CacheStore(config.CACHE_DIR / "api_cache.sqlite")
+
+
+def _is_fresh(path: Path, ttl: int, sources: Iterable[Path]) -> bool:
+    """
+    Check whether a cache file is younger than ttl and all its sources.
+
+    Args:
+        path: Cache file path
+        ttl: Maximum cache age in seconds
+        sources: Files the cached data was built from
+
+    Returns:
+        True if the cache file can be used
+    """
+    if not path.exists():
+        return False
+
+    cache_mtime = path.stat().st_mtime
+    if time.time() - cache_mtime >= ttl:
+        return False
+
+    for source in sources:
+        if not source.exists() or source.stat().st_mtime > cache_mtime:
+            return False
+
+    return True
+
+
+def clear_frames(pattern: str = '*') -> int:
+    """
+    Delete Parquet cache files.
+
+    Args:
+        pattern: Glob pattern for the cache keys to delete
+
+    Returns:
+        Number of deleted files
+    """
+    deleted = 0
+    for cache_file in config.CACHE_DIR.glob(f"{pattern}.parquet"):
+        try:
+            cache_file.unlink()
+            deleted += 1
+        except Exception as e:
+            logger.warning(f"Failed to delete {cache_file}: {e}")
+    return deleted
+
+
+def load_or_build(key: str, builder: Callable[[], pd.DataFrame], ttl: int,
+                  sources: Iterable[Path] = ()) -> pd.DataFrame:
+    """
+    Load a DataFrame from the Parquet cache, rebuilding it on a miss.
+
+    Args:
+        key: Cache key, used as the file name
+        builder: Function that builds the DataFrame on a cache miss
+        ttl: Maximum cache age in seconds
+        sources: Files the DataFrame is built from; a newer source invalidates the cache
+
+    Returns:
+        Cached or freshly built DataFrame
+    """
+    cache_file = config.CACHE_DIR / f"{key}.parquet"
+    sources = list(sources)
+
+    if _is_fresh(cache_file, ttl, sources):
+        try:
+            df = pd.read_parquet(cache_file, engine='pyarrow')
+            logger.info(f"Using cached data for {key}")
+            return df
+        except Exception as e:
+            logger.warning(f"Failed to read cache: {e}")
+
+    df = builder()
+
+    # Empty results are not cached so the next call retries the build
+    if not df.empty:
+        # Write a temporary file and move it into place, so concurrent
+        # readers never see a partially written cache file
+        tmp_file = cache_file.with_name(cache_file.name + f'.{threading.get_ident()}.tmp')
+        try:
+            config.ensure_dir(config.CACHE_DIR)
+            df.to_parquet(tmp_file, engine='pyarrow', compression='zstd')
+            tmp_file.replace(cache_file)
+            logger.info(f"Cached data for {key}")
+        except Exception as e:
+            logger.warning(f"Failed to write cache: {e}")
+            tmp_file.unlink(missing_ok=True)
+
+    return df
@@ -3,8 +3,10 @@ Company classifier for identifying cosmetic raw material suppliers.
 """
 
 import logging
+import ahocorasick
 import pandas as pd
-from typing import Tuple, List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, List, Dict, Optional
 from tqdm import tqdm
 
 import config
@@ -26,7 +28,33 @@ class CompanyClassifier:
         self.dart_client = dart_client
         self.cosmetic_ksic_codes = config.COSMETIC_KSIC_CODES
         self.keywords = config.CLASSIFICATION_KEYWORDS
+        self.keyword_automaton = self._build_keyword_automaton(self.keywords)
         self.threshold = config.CLASSIFICATION_THRESHOLD
+        # Keyword score per text; names and summaries repeat across runs
+        self._keyword_scores: Dict[str, int] = {}
+
+    @staticmethod
+    def _build_keyword_automaton(keywords: Dict[str, List[str]]) -> ahocorasick.Automaton:
+        """
+        Compile all classification keywords into one Aho-Corasick automaton.
+
+        Args:
+            keywords: Keyword lists by priority
+
+        Returns:
+            Automaton whose matches yield (keyword, score), so one scan of a
+            text finds every keyword and repeated matches can be counted once
+        """
+        automaton = ahocorasick.Automaton()
+        for priority, score in [
+            ('high_priority', config.HIGH_PRIORITY_KEYWORD_SCORE),
+            ('medium_priority', config.MEDIUM_PRIORITY_KEYWORD_SCORE),
+            ('low_priority', config.LOW_PRIORITY_KEYWORD_SCORE),
+        ]:
+            for keyword in keywords[priority]:
+                automaton.add_word(keyword.lower(), (keyword.lower(), score))
+        automaton.make_automaton()
+        return automaton
 
     def _check_keywords(self, text: str) -> int:
         """
@@ -41,23 +69,11 @@ class CompanyClassifier:
         if not text:
             return 0
 
-        text_lower = text.lower()
-        score = 0
-
-        # Check high priority keywords
-        for keyword in self.keywords['high_priority']:
-            if keyword.lower() in text_lower:
-                score += config.HIGH_PRIORITY_KEYWORD_SCORE
-
-        # Check medium priority keywords
-        for keyword in self.keywords['medium_priority']:
-            if keyword.lower() in text_lower:
-                score += config.MEDIUM_PRIORITY_KEYWORD_SCORE
-
-        # Check low priority keywords
-        for keyword in self.keywords['low_priority']:
-            if keyword.lower() in text_lower:
-                score += config.LOW_PRIORITY_KEYWORD_SCORE
+        score = self._keyword_scores.get(text)
+        if score is None:
+            # Each keyword scores once, however often it appears
+            matched = {value for _, value in self.keyword_automaton.iter(text.lower())}
+            score = self._keyword_scores[text] = sum(score for _, score in matched)
 
         return score
 
@@ -100,6 +116,23 @@ class CompanyClassifier:
         is_cosmetic = score >= self.threshold
         return is_cosmetic, score
 
+    def _fetch_company_infos(self, corp_codes: List[str], progress_bar: bool = True) -> List[Optional[Dict]]:
+        """
+        Fetch company details concurrently.
+
+        Args:
+            corp_codes: Company codes to fetch
+            progress_bar: Show progress bar
+
+        Returns:
+            Company details in the order of corp_codes, None where unavailable
+        """
+        with ThreadPoolExecutor(max_workers=config.API_MAX_WORKERS) as executor:
+            infos = executor.map(self.dart_client.get_company_info, corp_codes)
+            if progress_bar:
+                infos = tqdm(infos, total=len(corp_codes), desc="Fetching company info")
+            return list(infos)
+
     def classify_all(self, corp_list: List[Dict] = None, progress_bar: bool = True) -> pd.DataFrame:
         """
         Classify all companies and return results.
@@ -117,32 +150,35 @@ class CompanyClassifier:
         if corp_list is None:
             corp_list = self.dart_client.get_corp_codes()
 
-        results = []
-        iterator = tqdm(corp_list, desc="Classifying companies") if progress_bar else corp_list
-
-        for corp_info in iterator:
-            try:
-                is_cosmetic, score = self.classify_company(corp_info)
-
-                if is_cosmetic:
-                    results.append({
-                        'corp_code': corp_info.get('corp_code'),
-                        'corp_name': corp_info.get('corp_name'),
-                        'stock_code': corp_info.get('stock_code'),
-                        'classification_score': score,
-                        'is_cosmetic_raw_material': True
-                    })
-                    logger.info(f"Classified: {corp_info.get('corp_name')} (score: {score})")
+        corp_df = pd.DataFrame(corp_list).reindex(columns=['corp_code', 'corp_name', 'stock_code'])
+        infos = self._fetch_company_infos(corp_df['corp_code'].tolist(), progress_bar)
+
+        # Score all companies at once
+        ksic_codes = pd.Series(
+            [info.get('induty_code', '') if info else '' for info in infos], index=corp_df.index
+        )
+        business_summaries = pd.Series(
+            [info.get('est_dt', '') if info else '' for info in infos], index=corp_df.index
+        )
+        scores = (
+            ksic_codes.isin(list(self.cosmetic_ksic_codes)) * config.KSIC_MATCH_SCORE
+            + corp_df['corp_name'].fillna('').map(self._check_keywords)
+            + business_summaries.map(self._check_keywords)
+        )
+
+        is_cosmetic = scores >= self.threshold
+        df_results = corp_df.loc[is_cosmetic].assign(
+            classification_score=scores[is_cosmetic],
+            is_cosmetic_raw_material=True
+        ).reset_index(drop=True)
+
+        for corp_name, score in zip(df_results['corp_name'], df_results['classification_score']):
+            logger.info(f"Classified: {corp_name} (score: {score})")
 
-            except Exception as e:
-                logger.error(f"Error classifying {corp_info.get('corp_name')}: {e}")
-                continue
-
-        df_results = pd.DataFrame(results)
         logger.info(f"Classification complete: {len(df_results)} cosmetic companies found")
 
         # Save results
-        output_file = config.PROCESSED_DATA_DIR / "cosmetic_companies.csv"
+        output_file = config.ensure_dir(config.PROCESSED_DATA_DIR) / "cosmetic_companies.csv"
         df_results.to_csv(output_file, index=False, encoding='utf-8-sig')
         logger.info(f"Results saved to {output_file}")
 
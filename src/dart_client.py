@@ -4,16 +4,27 @@ DART API Client for fetching corporate and financial data.
 
 import requests
 import time
+import hashlib
+import inspect
 import json
-import xmltodict
 import zipfile
 import io
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional
 from functools import wraps
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the stdlib parser
+    orjson = None
 
 import config
+from src.cache_io import api_cache
 
 # Setup logging
 logging.basicConfig(
@@ -27,34 +38,66 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def cache_response(ttl_seconds: int):
-    """Decorator to cache API responses."""
+def _json_loads(data: bytes):
+    """Decode JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj) -> bytes:
+    """Encode an object as compact UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _cache_key(func_name: str, arguments: Dict) -> str:
+    """
+    Build a cache key that is stable across processes.
+
+    Args:
+        func_name: Name of the cached function
+        arguments: Bound call arguments, without self
+
+    Returns:
+        Hex digest of the function name and arguments
+    """
+    payload = json.dumps([func_name, arguments], sort_keys=True, ensure_ascii=False, default=str)
+    return f"{func_name}_{hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()}"
+
+
+def cache_response(ttl: int):
+    """Decorator to cache API responses for ttl seconds."""
     def decorator(func):
+        signature = inspect.signature(func)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Create cache key
-            cache_key = f"{func.__name__}_{hash(str(args) + str(kwargs))}"
-            cache_file = config.CACHE_DIR / f"{cache_key}.json"
+            # Key on the bound arguments, so positional and keyword calls (and
+            # omitted defaults) share an entry; self is not part of the key
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = {name: value for name, value in bound.arguments.items() if name != 'self'}
+            cache_key = _cache_key(func.__name__, arguments)
 
             # Check cache validity
-            if cache_file.exists():
-                cache_age = time.time() - cache_file.stat().st_mtime
-                if cache_age < ttl_seconds:
+            try:
+                cached = api_cache.get(cache_key, ttl)
+                if cached is not None:
                     logger.info(f"Using cached data for {func.__name__}")
-                    try:
-                        with open(cache_file, 'r', encoding='utf-8') as f:
-                            return json.load(f)
-                    except Exception as e:
-                        logger.warning(f"Failed to read cache: {e}")
+                    return _json_loads(cached)
+            except Exception as e:
+                logger.warning(f"Failed to read cache: {e}")
 
             # Fetch new data
             result = func(*args, **kwargs)
 
-            # Save to cache if result is valid
-            if result is not None:
+            # Save to cache if result is valid; None and empty results mean a
+            # failed call, which must stay retryable
+            if result:
                 try:
-                    with open(cache_file, 'w', encoding='utf-8') as f:
-                        json.dump(result, f, ensure_ascii=False, indent=2)
+                    api_cache.set(cache_key, _json_dumps(result))
                     logger.info(f"Cached data for {func.__name__}")
                 except Exception as e:
                     logger.warning(f"Failed to write cache: {e}")
@@ -64,6 +107,30 @@ def cache_response(ttl_seconds: int):
     return decorator
 
 
+class RateLimiter:
+    """Space out requests so that at most `rate` start per second, across threads."""
+
+    def __init__(self, rate: float):
+        """
+        Initialize rate limiter.
+
+        Args:
+            rate: Maximum requests per second
+        """
+        self.interval = 1.0 / rate
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the caller may send its request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
 class DartClient:
     """Client for interacting with DART Open API."""
 
@@ -79,58 +146,60 @@ class DartClient:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
-        # Keep connection alive
-        self.session.keep_alive = False
+        # Reuse pooled keep-alive connections; urllib3 retries with backoff
+        # and honours Retry-After on 429
+        adapter = HTTPAdapter(
+            pool_connections=config.HTTP_POOL_SIZE,
+            pool_maxsize=config.HTTP_POOL_SIZE,
+            max_retries=Retry(
+                total=config.API_RETRY_COUNT,
+                backoff_factor=config.RETRY_DELAY,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET"],
+                raise_on_status=False
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Shared by all threads using this client
+        self.rate_limiter = RateLimiter(config.API_RATE_LIMIT)
 
-    def _make_request(self, url: str, params: Optional[Dict] = None, retry_count: int = None) -> requests.Response:
+    def _make_request(self, url: str, params: Optional[Dict] = None) -> requests.Response:
         """
-        Make HTTP request with retry logic.
+        Make HTTP request; retries are handled by the session's adapter.
 
         Args:
             url: Request URL
             params: Query parameters
-            retry_count: Number of retries (default from config)
 
         Returns:
             Response object
 
         Raises:
-            requests.RequestException: If all retries fail
+            requests.RequestException: If the request fails or returns a non-200 status
         """
-        if retry_count is None:
-            retry_count = config.API_RETRY_COUNT
-
         if params is None:
             params = {}
 
-        for attempt in range(retry_count):
-            try:
-                logger.debug(f"Making request to {url} (attempt {attempt + 1}/{retry_count})")
-                response = self.session.get(url, params=params, timeout=config.API_TIMEOUT)
-
-                if response.status_code == 200:
-                    return response
-
-                elif response.status_code == 429:  # Rate limit
-                    wait_time = 60
-                    logger.warning(f"Rate limit hit, waiting {wait_time}s")
-                    time.sleep(wait_time)
-                    continue
-
-                else:
-                    logger.warning(f"API error {response.status_code}: {response.text[:200]}")
-
-            except requests.Timeout:
-                logger.warning(f"Timeout on attempt {attempt + 1}")
-                time.sleep(config.RETRY_DELAY)
-
-            except Exception as e:
-                logger.error(f"Request error on attempt {attempt + 1}: {e}")
-
-            if attempt < retry_count - 1:
-                time.sleep(config.RETRY_DELAY * (attempt + 1))  # Exponential backoff
-
-        raise requests.RequestException(f"Failed after {retry_count} attempts")
+        logger.debug(f"Making request to {url}")
+        self.rate_limiter.wait()
+        try:
+            response = self.session.get(url, params=params, timeout=config.API_TIMEOUT)
+        except requests.RequestException as e:
+            logger.error(f"Request error for {url}: {e}")
+            raise
+
+        if response.status_code != 200:
+            logger.warning(f"API error {response.status_code}: {response.text[:200]}")
+            # Only statuses in the Retry allowlist were retried
+            retries = getattr(response.raw, 'retries', None)
+            attempts = len(retries.history) if retries is not None else 0
+            message = f"API error {response.status_code}"
+            if attempts:
+                message += f" after {attempts} retries"
+            raise requests.RequestException(message)
+
+        return response
 
     @cache_response(config.COMPANY_CACHE_TTL)
     def get_corp_codes(self) -> List[Dict]:
@@ -160,9 +229,14 @@ class DartClient:
             with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
                 xml_content = zip_file.read('CORPCODE.xml')
 
-            # Parse XML to dict
-            data = xmltodict.parse(xml_content)
-            corp_list = data['result']['list']
+            # Stream-parse each <list> record, freeing elements as we go
+            corp_list = []
+            for _, element in etree.iterparse(io.BytesIO(xml_content), events=('end',), tag='list'):
+                # Blank fields (e.g. stock_code of unlisted companies) become None
+                corp_list.append({child.tag: (child.text or '').strip() or None for child in element})
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
 
             logger.info(f"Retrieved {len(corp_list)} companies")
             return corp_list
@@ -192,7 +266,7 @@ class DartClient:
             }
 
             response = self._make_request(url, params)
-            data = response.json()
+            data = _json_loads(response.content)
 
             if data.get('status') == '000':  # Success
                 return data
@@ -229,25 +303,18 @@ class DartClient:
                 'corp_code': corp_code,
                 'bsns_year': str(year),
                 'reprt_code': reprt_code,
-                'fs_div': 'CFS'  # Consolidated financial statement
             }
 
-            response = self._make_request(url, params)
-            data = response.json()
-
-            if data.get('status') == '000':  # Success
-                return data
-            else:
-                # Try with OFS (separate financial statement) if CFS fails
-                params['fs_div'] = 'OFS'
+            for fs_div in ('CFS', 'OFS'):  # Consolidated first, separate as fallback
+                params['fs_div'] = fs_div
                 response = self._make_request(url, params)
-                data = response.json()
+                data = _json_loads(response.content)
 
-                if data.get('status') == '000':
+                if data.get('status') == '000':  # Success
                     return data
-                else:
-                    logger.warning(f"No financial data for {corp_code} {year}: {data.get('message')}")
-                    return None
+
+            logger.warning(f"No financial data for {corp_code} {year}: {data.get('message')}")
+            return None
 
         except Exception as e:
             logger.error(f"Failed to fetch financial statement for {corp_code} {year}: {e}")
@@ -256,10 +323,11 @@ class DartClient:
     def clear_cache(self):
         """Clear all cached responses."""
         logger.info("Clearing cache")
-        cache_files = list(config.CACHE_DIR.glob("*.json"))
-        for cache_file in cache_files:
+        cleared = api_cache.clear()
+        # Per-call JSON files written before the SQLite store
+        for cache_file in config.CACHE_DIR.glob("*.json"):
             try:
                 cache_file.unlink()
             except Exception as e:
                 logger.warning(f"Failed to delete {cache_file}: {e}")
-        logger.info(f"Cleared {len(cache_files)} cache files")
+        logger.info(f"Cleared {cleared} cached responses")
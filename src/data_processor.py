@@ -5,44 +5,118 @@ Data processor for financial analysis and metrics calculation.
 import logging
 import pandas as pd
 import numpy as np
+import xlsxwriter
 from typing import Dict
 
+try:
+    import polars as pl
+except ImportError:  # Optional engine, see config.USE_POLARS
+    pl = None
+
 import config
+from src.cache_io import clear_frames, load_or_build
+from src.financial_collector import migrate_financial_csv
 
 logger = logging.getLogger(__name__)
 
+# Bump when the metric calculation changes so cached metrics are rebuilt
+METRICS_CACHE_VERSION = 2
+
+
+def _percent_ratio(numerator: pd.Series, denominator: pd.Series) -> np.ndarray:
+    """
+    Compute numerator / denominator * 100, rounded to two decimals.
+
+    Args:
+        numerator: Numerator values
+        denominator: Denominator values
+
+    Returns:
+        Ratios, NaN where the denominator is zero
+    """
+    num = numerator.to_numpy(dtype=np.float64)
+    den = denominator.to_numpy(dtype=np.float64)
+    # Zero denominators are skipped instead of producing inf to replace afterwards
+    ratio = np.divide(num, den, out=np.full_like(num, np.nan), where=den != 0)
+    ratio *= 100
+    return np.round(ratio, 2, out=ratio)
+
+
+def _write_sheet(worksheet, df: pd.DataFrame, header_format, chunk_rows: int = 10000):
+    """
+    Write a DataFrame to a worksheet in row order.
+
+    Args:
+        worksheet: xlsxwriter worksheet
+        df: DataFrame to write, without its index
+        header_format: Cell format for the header row
+        chunk_rows: Rows converted to Python values at a time
+    """
+    worksheet.write_row(0, 0, [str(col) for col in df.columns], header_format)
+
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        # Missing values become None, which xlsxwriter leaves as empty cells;
+        # infinities are written as 'inf' text like DataFrame.to_excel does
+        # (replace runs first: on object columns it would turn None back into NaN)
+        values = (
+            chunk.replace({np.inf: 'inf', -np.inf: '-inf'})
+            .astype(object)
+            .where(chunk.notna(), None)
+        )
+        for row, record in enumerate(values.itertuples(index=False, name=None), start=start + 1):
+            worksheet.write_row(row, 0, record)
+
 
 class DataProcessor:
     """Processor for financial data analysis."""
 
     def __init__(self):
         """Initialize data processor."""
-        pass
+        self.companies_file = config.PROCESSED_DATA_DIR / "selected_companies.csv"
+        self.financial_file = config.PROCESSED_DATA_DIR / "financial_data.parquet"
+        # Last prepare_dashboard_data() result and the file versions it was built from
+        self._dashboard_cache = {}
+
+    def _load_companies(self) -> pd.DataFrame:
+        """Read the selected companies file."""
+        if not self.companies_file.exists():
+            logger.warning("Companies file not found")
+            return pd.DataFrame()
+
+        companies_df = pd.read_csv(
+            self.companies_file, encoding='utf-8-sig',
+            dtype={'corp_code': str, 'stock_code': str}
+        )
+        logger.info(f"Loaded {len(companies_df)} companies")
+        return companies_df
+
+    def _load_financial(self) -> pd.DataFrame:
+        """Read the collected financial data file."""
+        migrate_financial_csv(self.financial_file)
+        if not self.financial_file.exists():
+            logger.warning("Financial data file not found")
+            return pd.DataFrame()
+
+        financial_df = pd.read_parquet(self.financial_file, engine='pyarrow')
+        logger.info(f"Loaded {len(financial_df)} financial records")
+        return financial_df
 
     def load_data(self) -> tuple[pd.DataFrame, pd.DataFrame]:
         """
-        Load companies and financial data from files.
+        Load companies and financial data.
+
+        The companies CSV goes through the Parquet cache; the financial
+        data is already stored as Parquet.
 
         Returns:
             Tuple of (companies_df, financial_df)
         """
-        companies_file = config.PROCESSED_DATA_DIR / "selected_companies.csv"
-        financial_file = config.PROCESSED_DATA_DIR / "financial_data.csv"
-
-        companies_df = pd.DataFrame()
-        financial_df = pd.DataFrame()
-
-        if companies_file.exists():
-            companies_df = pd.read_csv(companies_file, encoding='utf-8-sig')
-            logger.info(f"Loaded {len(companies_df)} companies")
-        else:
-            logger.warning("Companies file not found")
-
-        if financial_file.exists():
-            financial_df = pd.read_csv(financial_file, encoding='utf-8-sig')
-            logger.info(f"Loaded {len(financial_df)} financial records")
-        else:
-            logger.warning("Financial data file not found")
+        companies_df = load_or_build(
+            'dashboard_companies', self._load_companies,
+            config.COMPANY_CACHE_TTL, sources=[self.companies_file]
+        )
+        financial_df = self._load_financial()
 
         return companies_df, financial_df
 
@@ -82,33 +156,89 @@ class DataProcessor:
         if df_pivot.empty:
             return pd.DataFrame()
 
-        df = df_pivot.copy()
+        # sort_values returns a new frame, so df_pivot is left untouched
+        df = df_pivot.sort_values(['corp_code', 'year'])
 
         # Calculate profitability ratios
         if '매출액' in df.columns and '영업이익' in df.columns:
-            df['영업이익률'] = (df['영업이익'] / df['매출액'] * 100).round(2)
-            df['영업이익률'] = df['영업이익률'].replace([np.inf, -np.inf], np.nan)
+            df['영업이익률'] = _percent_ratio(df['영업이익'], df['매출액'])
 
         if '매출액' in df.columns and '당기순이익' in df.columns:
-            df['순이익률'] = (df['당기순이익'] / df['매출액'] * 100).round(2)
-            df['순이익률'] = df['순이익률'].replace([np.inf, -np.inf], np.nan)
+            df['순이익률'] = _percent_ratio(df['당기순이익'], df['매출액'])
 
         # Calculate financial ratios
         if '자산총계' in df.columns and '부채총계' in df.columns:
-            df['부채비율'] = (df['부채총계'] / (df['자산총계'] - df['부채총계']) * 100).round(2)
-            df['부채비율'] = df['부채비율'].replace([np.inf, -np.inf], np.nan)
+            df['부채비율'] = _percent_ratio(df['부채총계'], df['자산총계'] - df['부채총계'])
 
         # Calculate YoY growth rates for each company
-        df = df.sort_values(['corp_code', 'year'])
+        by_company = df.groupby('corp_code', sort=False)
 
         for metric in ['매출액', '영업이익', '당기순이익']:
             if metric in df.columns:
-                df[f'{metric}_성장률'] = df.groupby('corp_code')[metric].pct_change() * 100
-                df[f'{metric}_성장률'] = df[f'{metric}_성장률'].round(2)
+                df[f'{metric}_성장률'] = (by_company[metric].pct_change() * 100).round(2)
 
         logger.info("Calculated financial metrics")
         return df
 
+    def calculate_metrics_polars(self, financial_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Pivot and calculate metrics in one lazy Polars query.
+
+        Produces the same frame as calculate_metrics(pivot_financial_data(...)),
+        with multithreaded execution. Used when config.USE_POLARS is set.
+
+        Args:
+            financial_df: Financial data in long format
+
+        Returns:
+            DataFrame with calculated metrics
+        """
+        if financial_df.empty:
+            return pd.DataFrame()
+
+        keys = ['corp_code', 'corp_name', 'year']
+        metrics = sorted(financial_df['metric_name'].unique())
+
+        def percent_ratio(numerator: str, denominator):
+            ratio = pl.col(numerator) / denominator * 100
+            return pl.when(denominator != 0).then(ratio).otherwise(None).round(2)
+
+        ratios = []
+        if {'매출액', '영업이익'} <= set(metrics):
+            ratios.append(percent_ratio('영업이익', pl.col('매출액')).alias('영업이익률'))
+        if {'매출액', '당기순이익'} <= set(metrics):
+            ratios.append(percent_ratio('당기순이익', pl.col('매출액')).alias('순이익률'))
+        if {'자산총계', '부채총계'} <= set(metrics):
+            ratios.append(percent_ratio('부채총계', pl.col('자산총계') - pl.col('부채총계')).alias('부채비율'))
+
+        # Same as pandas' groupby pct_change: forward-fill within the company first
+        growth = []
+        for metric in ['매출액', '영업이익', '당기순이익']:
+            if metric in metrics:
+                filled = pl.col(metric).forward_fill().over('corp_code')
+                growth.append(
+                    ((filled / filled.shift(1).over('corp_code') - 1) * 100).round(2).alias(f'{metric}_성장률')
+                )
+
+        df_metrics = (
+            pl.from_pandas(financial_df[keys + ['metric_name', 'value']])
+            .lazy()
+            .group_by(keys)
+            .agg([
+                pl.col('value').filter(pl.col('metric_name') == metric).drop_nulls().first().alias(metric)
+                for metric in metrics
+            ])
+            .sort(['corp_code', 'year'])
+            .with_columns(ratios)
+            .with_columns(growth)
+            .collect()
+            .to_pandas()
+        )
+        df_metrics.columns.name = 'metric_name'
+
+        logger.info("Calculated financial metrics with Polars")
+        return df_metrics
+
     def calculate_industry_average(self, df_metrics: pd.DataFrame) -> pd.DataFrame:
         """
         Calculate industry averages by year.
@@ -122,9 +252,10 @@ class DataProcessor:
         if df_metrics.empty:
             return pd.DataFrame()
 
-        # Group by year and calculate averages
-        numeric_cols = df_metrics.select_dtypes(include=[np.number]).columns
-        df_avg = df_metrics.groupby('year')[numeric_cols].mean().reset_index()
+        # Group by year and average only the metric columns; scanning every
+        # numeric column also picked up 'year', which reset_index cannot re-insert
+        metric_cols = [col for col in config.INDUSTRY_METRIC_COLS if col in df_metrics.columns]
+        df_avg = df_metrics.groupby('year', sort=True, as_index=False)[metric_cols].mean()
 
         df_avg['corp_name'] = '산업 평균'
         df_avg['corp_code'] = 'INDUSTRY_AVG'
@@ -148,10 +279,23 @@ class DataProcessor:
         if df_metrics.empty or metric not in df_metrics.columns:
             return pd.DataFrame()
 
-        df_year = df_metrics[df_metrics['year'] == year].copy()
-        df_top = df_year.nlargest(n, metric)[['corp_name', 'year', metric]]
+        # Rank positions instead of copying the year's rows; NaN values never rank
+        values = df_metrics[metric].to_numpy(dtype=np.float64)
+        positions = np.flatnonzero((df_metrics['year'].to_numpy() == year) & ~np.isnan(values))
+        n = min(n, positions.size)
+        if n == 0:
+            return df_metrics.iloc[:0][['corp_name', 'year', metric]]
+
+        # Partition to find the n-th largest value; ties at that value keep
+        # their row order, as nlargest(keep='first') does
+        candidates = values[positions]
+        kth = -np.partition(-candidates, n - 1)[n - 1]
+        above = np.flatnonzero(candidates > kth)
+        ties = np.flatnonzero(candidates == kth)[:n - above.size]
+        top = np.concatenate([above, ties])
+        top = top[np.argsort(-candidates[top], kind='stable')]
 
-        return df_top
+        return df_metrics.iloc[positions[top]][['corp_name', 'year', metric]]
 
     def get_summary_statistics(self, df_metrics: pd.DataFrame) -> Dict:
         """
@@ -188,13 +332,34 @@ class DataProcessor:
 
         return stats
 
+    def _data_version(self) -> tuple:
+        """Return the modification times of the input files (None if missing)."""
+        return tuple(
+            path.stat().st_mtime_ns if path.exists() else None
+            for path in (self.companies_file, self.financial_file)
+        )
+
     def prepare_dashboard_data(self) -> Dict[str, pd.DataFrame]:
         """
         Prepare all data needed for dashboard.
 
+        The result is kept until an input file changes, so an export after a
+        dashboard render reuses it. Callers must not mutate the frames.
+
         Returns:
             Dictionary of DataFrames for dashboard
         """
+        version = self._data_version()
+        if self._dashboard_cache.get('version') == version:
+            logger.info("Using prepared dashboard data")
+            return dict(self._dashboard_cache['data'])
+
+        data = self._prepare_dashboard_data()
+        self._dashboard_cache = {'version': version, 'data': data}
+        return dict(data)
+
+    def _prepare_dashboard_data(self) -> Dict[str, pd.DataFrame]:
+        """Load the input files and compute the dashboard frames."""
         logger.info("Preparing dashboard data")
 
         companies_df, financial_df = self.load_data()
@@ -208,10 +373,24 @@ class DataProcessor:
                 'industry_avg': pd.DataFrame(),
             }
 
-        # Process data
-        df_pivot = self.pivot_financial_data(financial_df)
-        df_metrics = self.calculate_metrics(df_pivot)
-        df_industry_avg = self.calculate_industry_average(df_metrics)
+        # Process data (derived frames are cached until the financial file changes;
+        # the key names the code version and engine that built them)
+        if config.USE_POLARS and pl is not None:
+            engine = 'polars'
+            build_metrics = lambda: self.calculate_metrics_polars(financial_df)
+        else:
+            engine = 'pandas'
+            build_metrics = lambda: self.calculate_metrics(self.pivot_financial_data(financial_df))
+        key_suffix = f"v{METRICS_CACHE_VERSION}_{engine}"
+        df_metrics = load_or_build(
+            f'dashboard_metrics_{key_suffix}', build_metrics,
+            config.FINANCIAL_CACHE_TTL, sources=[self.financial_file]
+        )
+        df_industry_avg = load_or_build(
+            f'dashboard_industry_avg_{key_suffix}',
+            lambda: self.calculate_industry_average(df_metrics),
+            config.FINANCIAL_CACHE_TTL, sources=[self.financial_file]
+        )
 
         logger.info("Dashboard data prepared")
 
@@ -222,22 +401,45 @@ class DataProcessor:
             'industry_avg': df_industry_avg,
         }
 
-    def export_to_excel(self, output_path: str = None):
+    def clear_cache(self) -> int:
+        """
+        Delete the dashboard Parquet caches and forget the prepared data.
+
+        Returns:
+            Number of deleted cache files
+        """
+        self._dashboard_cache = {}
+        deleted = clear_frames('dashboard_*')
+        logger.info(f"Cleared {deleted} dashboard cache files")
+        return deleted
+
+    def export_to_excel(self, output_path: str = None, data: Dict[str, pd.DataFrame] = None):
         """
         Export all data to Excel file.
 
         Args:
             output_path: Output file path (default: processed_data_dir)
+            data: Already loaded dashboard data (default: prepare_dashboard_data())
         """
         if output_path is None:
-            output_path = config.PROCESSED_DATA_DIR / "cosmetic_analysis.xlsx"
-
-        data = self.prepare_dashboard_data()
-
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            data['companies'].to_excel(writer, sheet_name='Companies', index=False)
-            data['financial'].to_excel(writer, sheet_name='Financial_Raw', index=False)
-            data['metrics'].to_excel(writer, sheet_name='Metrics', index=False)
-            data['industry_avg'].to_excel(writer, sheet_name='Industry_Average', index=False)
+            output_path = config.ensure_dir(config.PROCESSED_DATA_DIR) / "cosmetic_analysis.xlsx"
+
+        if data is None:
+            data = self.prepare_dashboard_data()
+
+        # constant_memory flushes each row to disk once the next one starts,
+        # so sheets are written row by row rather than through DataFrame.to_excel
+        workbook = xlsxwriter.Workbook(str(output_path), {'constant_memory': True})
+        try:
+            header_format = workbook.add_format({'bold': True, 'border': 1})
+            for sheet_name, key in [
+                ('Companies', 'companies'),
+                ('Financial_Raw', 'financial'),
+                ('Metrics', 'metrics'),
+                ('Industry_Average', 'industry_avg'),
+            ]:
+                _write_sheet(workbook.add_worksheet(sheet_name), data[key], header_format)
+        finally:
+            workbook.close()
 
         logger.info(f"Data exported to {output_path}")
@@ -4,8 +4,11 @@ Financial data collector for classified companies.
 
 import logging
 import pandas as pd
-import time
-from typing import List, Dict
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Dict, Optional
 from tqdm import tqdm
 
 import config
@@ -13,6 +16,116 @@ from src.dart_client import DartClient
 
 logger = logging.getLogger(__name__)
 
+# Columns of the records produced by FinancialCollector._parse_financial_data
+FINANCIAL_SCHEMA = pa.schema([
+    ('corp_code', pa.string()),
+    ('corp_name', pa.string()),
+    ('year', pa.int64()),
+    ('metric_name', pa.string()),
+    ('value', pa.float64()),
+    ('unit', pa.string()),
+])
+
+
+class FinancialDataWriter:
+    """
+    Stream financial records to a Parquet file as they are collected.
+
+    Records go to a temporary file that replaces the output file on a
+    successful close, so readers never see a partial file.
+    """
+
+    def __init__(self, output_file: Path):
+        """
+        Initialize writer.
+
+        Args:
+            output_file: Parquet file to write
+        """
+        self.output_file = Path(output_file)
+        self.tmp_file = self.output_file.with_name(self.output_file.name + '.tmp')
+        self.num_records = 0
+        self._writer = None
+
+    def write(self, records: List[Dict]):
+        """
+        Append records to the file.
+
+        Args:
+            records: Financial records
+        """
+        if not records:
+            return
+
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.tmp_file, FINANCIAL_SCHEMA, compression='zstd')
+        self._writer.write_table(pa.Table.from_pylist(records, schema=FINANCIAL_SCHEMA))
+        self.num_records += len(records)
+
+    def close(self) -> int:
+        """
+        Finish the file and move it into place.
+
+        The output file is left untouched if no records were written.
+
+        Returns:
+            Number of records written
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self.tmp_file.replace(self.output_file)
+        return self.num_records
+
+    def abort(self):
+        """Discard everything written so far."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self.tmp_file.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def migrate_financial_csv(output_file: Path) -> bool:
+    """
+    Convert a financial_data.csv written by earlier versions to Parquet.
+
+    Runs only when the Parquet file is missing and the CSV exists next to it;
+    the CSV is left in place.
+
+    Args:
+        output_file: Parquet file to create
+
+    Returns:
+        True if the CSV was converted
+    """
+    output_file = Path(output_file)
+    csv_file = output_file.with_suffix('.csv')
+    if output_file.exists() or not csv_file.exists():
+        return False
+
+    logger.info(f"Converting {csv_file} to Parquet")
+    df = pd.read_csv(csv_file, encoding='utf-8-sig', dtype={'corp_code': str})
+
+    # Written through a temporary file like FinancialDataWriter
+    tmp_file = output_file.with_name(output_file.name + '.tmp')
+    df[FINANCIAL_SCHEMA.names].to_parquet(
+        tmp_file, engine='pyarrow', compression='zstd',
+        schema=FINANCIAL_SCHEMA, index=False
+    )
+    tmp_file.replace(output_file)
+
+    logger.info(f"Converted {len(df)} financial records to {output_file}")
+    return True
+
 
 class FinancialCollector:
     """Collector for financial statement data."""
@@ -26,7 +139,7 @@ class FinancialCollector:
         """
         self.dart_client = dart_client
         self.collection_years = config.COLLECTION_YEARS
-        self.financial_metrics = config.FINANCIAL_METRICS
+        self.financial_metrics = frozenset(config.FINANCIAL_METRICS)
 
     def _parse_financial_data(self, data: Dict, corp_code: str, corp_name: str, year: int) -> List[Dict]:
         """
@@ -49,25 +162,25 @@ class FinancialCollector:
         for item in data['list']:
             account_nm = item.get('account_nm', '')
 
-            # Check if this is a metric we're tracking
-            if account_nm in self.financial_metrics:
-                # Parse value
-                thstrm_amount = item.get('thstrm_amount', '0')
+            # Skip metrics we're not tracking before touching the other fields
+            if account_nm not in self.financial_metrics:
+                continue
 
-                # Clean value (remove commas, convert to float)
-                try:
-                    value = float(str(thstrm_amount).replace(',', ''))
-                except (ValueError, AttributeError):
-                    value = 0.0
-
-                records.append({
-                    'corp_code': corp_code,
-                    'corp_name': corp_name,
-                    'year': year,
-                    'metric_name': account_nm,
-                    'value': value,
-                    'unit': item.get('currency', 'KRW')
-                })
+            # Clean value (remove commas, convert to float)
+            thstrm_amount = item.get('thstrm_amount', '0')
+            try:
+                value = float(str(thstrm_amount).replace(',', ''))
+            except (ValueError, AttributeError):
+                value = 0.0
+
+            records.append({
+                'corp_code': corp_code,
+                'corp_name': corp_name,
+                'year': year,
+                'metric_name': account_nm,
+                'value': value,
+                'unit': item.get('currency', 'KRW')
+            })
 
         return records
 
@@ -100,22 +213,22 @@ class FinancialCollector:
                 else:
                     logger.warning(f"No financial data for {corp_name} in {year}")
 
-                # Rate limiting
-                time.sleep(0.1)
-
             except Exception as e:
                 logger.error(f"Error collecting {year} data for {corp_name}: {e}")
                 continue
 
         return all_records
 
-    def collect_all(self, companies_df: pd.DataFrame = None, progress_bar: bool = True) -> pd.DataFrame:
+    def collect_all(self, companies_df: pd.DataFrame = None, progress_bar: bool = True,
+                    on_progress: Optional[Callable[[int, int, str, int], None]] = None) -> pd.DataFrame:
         """
         Collect financial data for all classified companies.
 
         Args:
             companies_df: DataFrame with classified companies (default: load from file)
             progress_bar: Show progress bar
+            on_progress: Called on the calling thread after each company with
+                (companies done, total companies, corp_name, records collected)
 
         Returns:
             DataFrame with financial data
@@ -126,41 +239,48 @@ class FinancialCollector:
         if companies_df is None:
             companies_file = config.PROCESSED_DATA_DIR / "cosmetic_companies.csv"
             if companies_file.exists():
-                companies_df = pd.read_csv(companies_file, encoding='utf-8-sig')
+                companies_df = pd.read_csv(
+                    companies_file, encoding='utf-8-sig',
+                    dtype={'corp_code': str, 'stock_code': str}
+                )
             else:
                 logger.error("No companies file found. Run classification first.")
                 return pd.DataFrame()
 
-        all_records = []
-        iterator = tqdm(companies_df.iterrows(), total=len(companies_df), desc="Collecting financials") if progress_bar else companies_df.iterrows()
-
-        for _, row in iterator:
-            corp_code = row['corp_code']
-            corp_name = row['corp_name']
-
-            try:
-                records = self.collect_company_financials(corp_code, corp_name)
-                all_records.extend(records)
+        # Companies are fetched concurrently; DartClient's rate limiter paces the requests.
+        # Results are written in companies_df order, one company at a time. Only
+        # collection errors skip a company; a write error aborts the file.
+        output_file = config.ensure_dir(config.PROCESSED_DATA_DIR) / "financial_data.parquet"
+        with FinancialDataWriter(output_file) as writer, \
+                ThreadPoolExecutor(max_workers=config.API_MAX_WORKERS) as executor:
+            futures = [
+                (executor.submit(self.collect_company_financials, corp_code, corp_name), corp_name)
+                for corp_code, corp_name in zip(companies_df['corp_code'], companies_df['corp_name'])
+            ]
+            if progress_bar:
+                futures = tqdm(futures, desc="Collecting financials")
+
+            total = len(companies_df)
+            for done, (future, corp_name) in enumerate(futures, start=1):
+                try:
+                    records = future.result()
+                except Exception as e:
+                    logger.error(f"Error processing {corp_name}: {e}")
+                    records = []
 
+                writer.write(records)
                 if records:
                     logger.info(f"Collected {len(records)} records for {corp_name}")
 
-            except Exception as e:
-                logger.error(f"Error processing {corp_name}: {e}")
-                continue
+                if on_progress is not None:
+                    on_progress(done, total, corp_name, len(records))
 
-        # Create DataFrame
-        df_financials = pd.DataFrame(all_records)
-
-        if not df_financials.empty:
-            # Save to file
-            output_file = config.PROCESSED_DATA_DIR / "financial_data.csv"
-            df_financials.to_csv(output_file, index=False, encoding='utf-8-sig')
-            logger.info(f"Saved {len(df_financials)} financial records to {output_file}")
-        else:
-            logger.warning("No financial data collected")
+        if writer.num_records:
+            logger.info(f"Saved {writer.num_records} financial records to {output_file}")
+            return self.get_financial_data()
 
-        return df_financials
+        logger.warning("No financial data collected")
+        return pd.DataFrame()
 
     def get_financial_data(self) -> pd.DataFrame:
         """
@@ -169,11 +289,12 @@ class FinancialCollector:
         Returns:
             DataFrame with financial data
         """
-        output_file = config.PROCESSED_DATA_DIR / "financial_data.csv"
+        output_file = config.PROCESSED_DATA_DIR / "financial_data.parquet"
+        migrate_financial_csv(output_file)
 
         if output_file.exists():
             logger.info(f"Loading financial data from {output_file}")
-            return pd.read_csv(output_file, encoding='utf-8-sig')
+            return pd.read_parquet(output_file, engine='pyarrow')
         else:
             logger.warning("No financial data file found. Run collect_all() first.")
             return pd.DataFrame()
@@ -3,12 +3,15 @@ Main Streamlit dashboard for Korean cosmetic raw material company analysis.
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from plotly.colors import qualitative
+from plotly.subplots import make_subplots
 
 import config
-from src.data_processor import DataProcessor
+from src.app_cache import get_dashboard_data
 
 # Page configuration
 st.set_page_config(
@@ -17,231 +20,318 @@ st.set_page_config(
     layout=config.LAYOUT
 )
 
-# Load data using cache
-@st.cache_data(ttl=3600)
-def load_dashboard_data():
-    """Load all dashboard data with caching."""
-    processor = DataProcessor()
-    return processor.prepare_dashboard_data()
-
-# Main app
-def main():
-    st.title(f"{config.PAGE_ICON} {config.PAGE_TITLE}")
-    st.markdown("### DART API 기반 재무제표 분석 대시보드")
-    st.markdown("---")
+@st.cache_data(ttl=3600, show_spinner=False)
+def filter_metrics(data_version: int, year_from: int, year_to: int, companies: tuple) -> pd.DataFrame:
+    """
+    Slice the metrics to a year range and set of companies with caching.
+
+    Args:
+        data_version: get_dashboard_data()['version'], so new data gets new entries
+        year_from: First year to include
+        year_to: Last year to include
+        companies: Company names, sorted so equal selections share an entry
+
+    Returns:
+        Matching rows of the metrics data
+    """
+    metrics_df = get_dashboard_data()['metrics']
+    corp_names = metrics_df['corp_name'].cat
+    # Compare category codes; names outside the categories map to -1 and are dropped
+    selected_codes = corp_names.categories.get_indexer(list(companies))
+    years = metrics_df['year'].to_numpy()
+    mask = (
+        (years >= year_from) &
+        (years <= year_to) &
+        np.isin(corp_names.codes.to_numpy(), selected_codes[selected_codes >= 0])
+    )
+    return metrics_df.iloc[mask]
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def latest_metrics(data_version: int, year_from: int, year_to: int, companies: tuple) -> pd.DataFrame:
+    """Return the most recent year of filter_metrics with caching."""
+    df = filter_metrics(data_version, year_from, year_to, companies)
+    return df[df['year'] == df['year'].max()]
+
+SUMMARY_COLS = ['매출액_억원', '영업이익률', '매출액_성장률']
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def summary_means(data_version: int, year_from: int, year_to: int, companies: tuple) -> pd.Series:
+    """Average the summary columns of latest_metrics in one reduction with caching."""
+    df_latest = latest_metrics(data_version, year_from, year_to, companies)
+    return df_latest[[col for col in SUMMARY_COLS if col in df_latest.columns]].mean()
+
+# Trend chart panels: (column, subplot title, y-axis label)
+TREND_PANELS = [
+    ('매출액_억원', '연도별 매출액 추이', '매출액 (억원)'),
+    ('영업이익_억원', '연도별 영업이익 추이', '영업이익 (억원)'),
+]
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def make_trend_figure(data_version: int, companies: tuple, year_range: tuple) -> go.Figure:
+    """
+    Build the yearly trend panels as one figure with a shared x axis.
+
+    Each company gets one WebGL line per panel and a single legend entry,
+    in the order of the selection.
+    Keyed on the data version and filter values rather than the data, so
+    reruns that keep the filter reuse the figure without hashing the
+    metrics frame.
+
+    Args:
+        data_version: get_dashboard_data()['version'], so new data gets new entries
+        companies: Selected company names, in selection order
+        year_range: (first year, last year) to include
+
+    Returns:
+        Plotly figure, None if no trend column is available
+    """
+    df = filter_metrics(data_version, year_range[0], year_range[1], tuple(sorted(companies)))
+    panels = [panel for panel in TREND_PANELS if panel[0] in df.columns]
+    if not panels:
+        return None
+
+    colors = qualitative.Plotly
+    fig = make_subplots(
+        rows=len(panels), cols=1, shared_xaxes=True,
+        subplot_titles=[title for _, title, _ in panels]
+    )
+    # Traces follow the selection order, so colors stay stable as companies are added
+    df_companies = dict(tuple(df.groupby('corp_name', sort=False, observed=True)))
+    for i, corp_name in enumerate(name for name in companies if name in df_companies):
+        df_company = df_companies[corp_name]
+        color = colors[i % len(colors)]
+        years = df_company['year'].to_numpy()
+        for row, (column, _, _) in enumerate(panels, start=1):
+            fig.add_trace(
+                go.Scattergl(
+                    x=years,
+                    y=df_company[column].to_numpy(),
+                    mode='lines+markers',
+                    name=corp_name,
+                    legendgroup=corp_name,
+                    showlegend=(row == 1),
+                    line=dict(color=color)
+                ),
+                row=row, col=1
+            )
 
-    # Load data
+    for row, (_, _, y_label) in enumerate(panels, start=1):
+        fig.update_yaxes(title_text=y_label, row=row, col=1)
+    fig.update_xaxes(title_text='연도', row=len(panels), col=1)
+    fig.update_layout(hovermode='x unified', height=350 * len(panels), legend_title_text='회사명')
+    return fig
+
+# Comparison table columns, formatted by st.dataframe on the client
+COMPARISON_COLUMN_CONFIG = {
+    'corp_name': st.column_config.TextColumn('회사명'),
+    '매출액_억원': st.column_config.NumberColumn('매출액 (억원)', format='%.0f'),
+    '영업이익_억원': st.column_config.NumberColumn('영업이익 (억원)', format='%.0f'),
+    '당기순이익_억원': st.column_config.NumberColumn('당기순이익 (억원)', format='%.0f'),
+    '영업이익률': st.column_config.NumberColumn('영업이익률 (%)', format='%.2f'),
+    '순이익률': st.column_config.NumberColumn('순이익률 (%)', format='%.2f'),
+}
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def comparison_table(data_version: int, year_from: int, year_to: int, companies: tuple) -> pd.DataFrame:
+    """
+    Select the latest-year company comparison columns with caching.
+
+    Args:
+        data_version: get_dashboard_data()['version'], so new data gets new entries
+        year_from: First year of the filter
+        year_to: Last year of the filter
+        companies: Sorted company names of the filter
+
+    Returns:
+        Unformatted comparison columns; COMPARISON_COLUMN_CONFIG handles
+        headers and rounding
+    """
+    df_latest = latest_metrics(data_version, year_from, year_to, companies)
+    return df_latest[[col for col in COMPARISON_COLUMN_CONFIG if col in df_latest.columns]]
+
+# Dashboard sections
+def render_section(title: str, render, *args):
+    """
+    Render one dashboard section under its subheader.
+
+    A failure is shown in place of that section only, so the rest of the
+    page still renders.
+
+    Args:
+        title: Section subheader
+        render: Function drawing the section body
+        *args: Arguments for render
+    """
+    st.subheader(title)
     try:
-        data = load_dashboard_data()
-        companies_df = data['companies']
-        metrics_df = data['metrics']
-        industry_avg_df = data['industry_avg']
-
-        if companies_df.empty:
-            st.warning("선택된 회사가 없습니다. '데이터 관리' 페이지에서 회사를 검색하고 추가해주세요.")
-            return
-
-        # Sidebar filters
-        st.sidebar.title("🔍 회사 검색 및 필터")
-        st.sidebar.markdown("---")
-
-        # Company search and selection
-        if not metrics_df.empty:
-            available_companies = sorted(metrics_df['corp_name'].unique())
-
-            # Search mode selector
-            search_mode = st.sidebar.radio(
-                "표시 방식",
-                options=["특정 회사만 보기", "여러 회사 비교"],
-                index=0
-            )
+        render(*args)
+    except Exception as e:
+        st.error(f"{title} 표시 중 오류가 발생했습니다: {e}")
 
-            if search_mode == "특정 회사만 보기":
-                # Single company search
-                selected_company = st.sidebar.selectbox(
-                    "회사 검색 (입력하여 검색)",
-                    options=["전체"] + available_companies,
-                    index=0
-                )
+def render_summary(df_filtered: pd.DataFrame, filter_key: tuple, total_companies: int):
+    """Show the latest-year KPI metrics."""
+    if df_filtered.empty:
+        return
 
-                if selected_company == "전체":
-                    selected_companies = available_companies[:min(10, len(available_companies))]
-                else:
-                    selected_companies = [selected_company]
-            else:
-                # Multiple company selection
-                selected_companies = st.sidebar.multiselect(
-                    "비교할 회사 선택",
-                    options=available_companies,
-                    default=available_companies[:min(5, len(available_companies))]
-                )
+    means = summary_means(*filter_key)
 
-            st.sidebar.markdown("---")
+    col1, col2, col3, col4 = st.columns(4)
 
-            # Year filter
-            available_years = sorted(metrics_df['year'].unique())
-            year_range = st.sidebar.slider(
-                "연도 범위",
-                min_value=int(min(available_years)),
-                max_value=int(max(available_years)),
-                value=(int(min(available_years)), int(max(available_years)))
-            )
+    with col1:
+        st.metric("선택된 회사 수", f"{total_companies}개")
 
-            # Filter data
-            df_filtered = metrics_df[
-                (metrics_df['year'] >= year_range[0]) &
-                (metrics_df['year'] <= year_range[1]) &
-                (metrics_df['corp_name'].isin(selected_companies))
-            ]
+    with col2:
+        if '매출액_억원' in means.index:
+            avg_revenue = means['매출액_억원']
+            st.metric("평균 매출액 (최근년도)", f"{avg_revenue:,.0f}억원")
         else:
-            df_filtered = pd.DataFrame()
-            st.warning("재무 데이터가 없습니다. '데이터 관리' 페이지에서 데이터를 수집해주세요.")
-            return
-
-        # Summary metrics
-        st.subheader("주요 지표 요약")
-
-        if not df_filtered.empty:
-            latest_year = df_filtered['year'].max()
-            df_latest = df_filtered[df_filtered['year'] == latest_year]
-
-            col1, col2, col3, col4 = st.columns(4)
-
-            with col1:
-                total_companies = len(selected_companies)
-                st.metric("선택된 회사 수", f"{total_companies}개")
-
-            with col2:
-                if '매출액' in df_latest.columns:
-                    avg_revenue = df_latest['매출액'].mean() / 100000000  # Convert to 억원
-                    st.metric("평균 매출액 (최근년도)", f"{avg_revenue:,.0f}억원")
-                else:
-                    st.metric("평균 매출액", "N/A")
-
-            with col3:
-                if '영업이익률' in df_latest.columns:
-                    avg_op_margin = df_latest['영업이익률'].mean()
-                    st.metric("평균 영업이익률", f"{avg_op_margin:.1f}%")
-                else:
-                    st.metric("평균 영업이익률", "N/A")
-
-            with col4:
-                if '매출액_성장률' in df_latest.columns:
-                    avg_growth = df_latest['매출액_성장률'].mean()
-                    st.metric("평균 매출 성장률 (YoY)", f"{avg_growth:.1f}%")
-                else:
-                    st.metric("평균 매출 성장률", "N/A")
-
-        st.markdown("---")
-
-        # Revenue trend chart
-        st.subheader("매출액 추이")
-
-        if not df_filtered.empty and '매출액' in df_filtered.columns:
-            # Convert to 억원
-            df_chart = df_filtered.copy()
-            df_chart['매출액_억원'] = df_chart['매출액'] / 100000000
-
-            fig_revenue = px.line(
-                df_chart,
-                x='year',
-                y='매출액_억원',
-                color='corp_name',
-                markers=True,
-                labels={'매출액_억원': '매출액 (억원)', 'year': '연도', 'corp_name': '회사명'},
-                title='연도별 매출액 추이'
-            )
-            fig_revenue.update_layout(hovermode='x unified')
-            st.plotly_chart(fig_revenue, use_container_width=True)
-        else:
-            st.info("매출액 데이터가 없습니다.")
-
-        # Operating profit trend
-        st.subheader("영업이익 추이")
-
-        if not df_filtered.empty and '영업이익' in df_filtered.columns:
-            df_chart = df_filtered.copy()
-            df_chart['영업이익_억원'] = df_chart['영업이익'] / 100000000
-
-            fig_profit = px.line(
-                df_chart,
-                x='year',
-                y='영업이익_억원',
-                color='corp_name',
-                markers=True,
-                labels={'영업이익_억원': '영업이익 (억원)', 'year': '연도', 'corp_name': '회사명'},
-                title='연도별 영업이익 추이'
-            )
-            fig_profit.update_layout(hovermode='x unified')
-            st.plotly_chart(fig_profit, use_container_width=True)
-        else:
-            st.info("영업이익 데이터가 없습니다.")
-
-        # Profitability analysis
-        st.subheader("수익성 분석")
+            st.metric("평균 매출액", "N/A")
 
-        col1, col2 = st.columns(2)
+    with col3:
+        if '영업이익률' in means.index:
+            avg_op_margin = means['영업이익률']
+            st.metric("평균 영업이익률", f"{avg_op_margin:.1f}%")
+        else:
+            st.metric("평균 영업이익률", "N/A")
 
-        with col1:
-            if not df_filtered.empty and '영업이익률' in df_filtered.columns:
-                fig_op_margin = px.box(
-                    df_filtered,
-                    x='year',
-                    y='영업이익률',
-                    labels={'영업이익률': '영업이익률 (%)', 'year': '연도'},
-                    title='연도별 영업이익률 분포'
-                )
-                st.plotly_chart(fig_op_margin, use_container_width=True)
+    with col4:
+        if '매출액_성장률' in means.index:
+            avg_growth = means['매출액_성장률']
+            st.metric("평균 매출 성장률 (YoY)", f"{avg_growth:.1f}%")
+        else:
+            st.metric("평균 매출 성장률", "N/A")
+
+def render_trends(df_filtered: pd.DataFrame, data_version: int, selected_companies: list, year_range: tuple):
+    """Show the revenue and operating profit trend figure."""
+    fig_trend = make_trend_figure(data_version, tuple(selected_companies), tuple(year_range)) if not df_filtered.empty else None
+    if fig_trend is not None:
+        st.plotly_chart(fig_trend, use_container_width=True)
+    else:
+        st.info("매출액 · 영업이익 데이터가 없습니다.")
+
+# Margin distribution panels: (column, chart title, y-axis label)
+MARGIN_BOX_PANELS = [
+    ('영업이익률', '연도별 영업이익률 분포', '영업이익률 (%)'),
+    ('순이익률', '연도별 순이익률 분포', '순이익률 (%)'),
+]
+
+def render_profitability(df_filtered: pd.DataFrame):
+    """Show the yearly margin distributions."""
+    for col, (column, title, y_label) in zip(st.columns(len(MARGIN_BOX_PANELS)), MARGIN_BOX_PANELS):
+        with col:
+            if df_filtered.empty or column not in df_filtered.columns:
+                st.info(f"{column} 데이터가 없습니다.")
+            # A box needs at least two companies in some year
+            elif df_filtered.groupby('year', sort=False)[column].count().max() < 2:
+                st.caption(f"{title}: 데이터 포인트 부족으로 분포도 생략")
             else:
-                st.info("영업이익률 데이터가 없습니다.")
-
-        with col2:
-            if not df_filtered.empty and '순이익률' in df_filtered.columns:
-                fig_net_margin = px.box(
+                fig_margin = px.box(
                     df_filtered,
                     x='year',
-                    y='순이익률',
-                    labels={'순이익률': '순이익률 (%)', 'year': '연도'},
-                    title='연도별 순이익률 분포'
+                    y=column,
+                    labels={column: y_label, 'year': '연도'},
+                    title=title
                 )
-                st.plotly_chart(fig_net_margin, use_container_width=True)
-            else:
-                st.info("순이익률 데이터가 없습니다.")
-
-        # Company comparison table
-        st.subheader("회사별 비교")
-
-        if not df_latest.empty:
-            display_cols = ['corp_name', '매출액', '영업이익', '당기순이익', '영업이익률', '순이익률']
-            display_cols = [col for col in display_cols if col in df_latest.columns]
-
-            df_display = df_latest[display_cols].copy()
-
-            # Format numbers
-            if '매출액' in df_display.columns:
-                df_display['매출액'] = (df_display['매출액'] / 100000000).round(0)
-            if '영업이익' in df_display.columns:
-                df_display['영업이익'] = (df_display['영업이익'] / 100000000).round(0)
-            if '당기순이익' in df_display.columns:
-                df_display['당기순이익'] = (df_display['당기순이익'] / 100000000).round(0)
-
-            # Rename columns
-            df_display = df_display.rename(columns={
-                'corp_name': '회사명',
-                '매출액': '매출액 (억원)',
-                '영업이익': '영업이익 (억원)',
-                '당기순이익': '당기순이익 (억원)',
-                '영업이익률': '영업이익률 (%)',
-                '순이익률': '순이익률 (%)'
-            })
-
-            st.dataframe(df_display, use_container_width=True)
+                st.plotly_chart(fig_margin, use_container_width=True)
+
+def render_comparison(filter_key: tuple):
+    """Show the latest-year company comparison table."""
+    df_display = comparison_table(*filter_key)
+
+    if not df_display.empty:
+        st.dataframe(df_display, use_container_width=True, column_config=COMPARISON_COLUMN_CONFIG)
+    else:
+        st.info("비교할 데이터가 없습니다.")
+
+def render_dashboard(data):
+    """
+    Draw the sidebar filters and the dashboard sections.
+
+    Args:
+        data: Dashboard data from get_dashboard_data
+    """
+    companies_df = data['companies']
+    metrics_df = data['metrics']
+
+    if companies_df.empty:
+        st.warning("선택된 회사가 없습니다. '데이터 관리' 페이지에서 회사를 검색하고 추가해주세요.")
+        return
+
+    if metrics_df.empty:
+        st.warning("재무 데이터가 없습니다. '데이터 관리' 페이지에서 데이터를 수집해주세요.")
+        return
+
+    # Sidebar filters
+    st.sidebar.title("🔍 회사 검색 및 필터")
+    st.sidebar.markdown("---")
+
+    # Company search and selection
+    available_companies = data['metric_company_names']
+
+    # Search mode selector
+    search_mode = st.sidebar.radio(
+        "표시 방식",
+        options=["특정 회사만 보기", "여러 회사 비교"],
+        index=0
+    )
+
+    if search_mode == "특정 회사만 보기":
+        # Single company search
+        selected_company = st.sidebar.selectbox(
+            "회사 검색 (입력하여 검색)",
+            options=["전체"] + available_companies,
+            index=0
+        )
+
+        if selected_company == "전체":
+            selected_companies = available_companies[:min(10, len(available_companies))]
         else:
-            st.info("비교할 데이터가 없습니다.")
+            selected_companies = [selected_company]
+    else:
+        # Multiple company selection
+        selected_companies = st.sidebar.multiselect(
+            "비교할 회사 선택",
+            options=available_companies,
+            default=available_companies[:min(5, len(available_companies))]
+        )
+
+    st.sidebar.markdown("---")
+
+    # Year filter
+    available_years = data['years']
+    year_range = st.sidebar.slider(
+        "연도 범위",
+        min_value=available_years[0],
+        max_value=available_years[-1],
+        value=(available_years[0], available_years[-1])
+    )
+
+    # Filter data
+    filter_key = (data['version'], year_range[0], year_range[1], tuple(sorted(selected_companies)))
+    df_filtered = filter_metrics(*filter_key)
+
+    render_section("주요 지표 요약", render_summary, df_filtered, filter_key, len(selected_companies))
+
+    st.markdown("---")
 
+    render_section("매출액 · 영업이익 추이", render_trends, df_filtered, data['version'], selected_companies, year_range)
+    render_section("수익성 분석", render_profitability, df_filtered)
+    render_section("회사별 비교", render_comparison, filter_key)
+
+# Main app
+def main():
+    st.title(f"{config.PAGE_ICON} {config.PAGE_TITLE}")
+    st.markdown("### DART API 기반 재무제표 분석 대시보드")
+    st.markdown("---")
+
+    # Load data
+    try:
+        data = get_dashboard_data()
     except Exception as e:
         st.error(f"데이터 로드 중 오류가 발생했습니다: {e}")
         st.info("'데이터 관리' 페이지에서 데이터를 수집해주세요.")
+    else:
+        render_dashboard(data)
 
     # Footer
     st.markdown("---")
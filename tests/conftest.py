@@ -0,0 +1,8 @@
+"""
+Shared test setup.
+"""
+
+import os
+
+# config refuses to import without an API key
+os.environ.setdefault("DART_API", "test-key")
@@ -0,0 +1,70 @@
+"""
+Tests for DartClient response caching.
+"""
+
+import io
+import zipfile
+from unittest import mock
+
+import pytest
+
+from src import dart_client
+from src.cache_io import CacheStore
+from src.dart_client import DartClient
+
+CORPCODE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<result>
+    <list>
+        <corp_code>00126380</corp_code>
+        <corp_name>삼성전자</corp_name>
+        <stock_code>005930</stock_code>
+        <modify_date>20240101</modify_date>
+    </list>
+    <list>
+        <corp_code>00000001</corp_code>
+        <corp_name>테스트화학</corp_name>
+        <stock_code> </stock_code>
+        <modify_date>20240101</modify_date>
+    </list>
+</result>
+"""
+
+
+def corpcode_response(xml: str) -> mock.Mock:
+    """Build a fake corpCode.xml response holding a zipped CORPCODE.xml."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zip_file:
+        zip_file.writestr('CORPCODE.xml', xml.encode('utf-8'))
+    response = mock.Mock(status_code=200, content=buffer.getvalue())
+    response.raise_for_status.return_value = None
+    return response
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """DartClient whose response cache lives in a temporary SQLite file."""
+    monkeypatch.setattr(dart_client, 'api_cache', CacheStore(tmp_path / "api_cache.sqlite"))
+    return DartClient("test-key")
+
+
+def test_get_corp_codes_is_cached(client):
+    client.session.get = mock.Mock(return_value=corpcode_response(CORPCODE_XML))
+
+    first = client.get_corp_codes()
+    second = client.get_corp_codes()
+
+    assert client.session.get.call_count == 1
+    assert second == first
+    assert first == [
+        {'corp_code': '00126380', 'corp_name': '삼성전자', 'stock_code': '005930', 'modify_date': '20240101'},
+        {'corp_code': '00000001', 'corp_name': '테스트화학', 'stock_code': None, 'modify_date': '20240101'},
+    ]
+
+
+def test_get_corp_codes_does_not_cache_empty_result(client):
+    client.session.get = mock.Mock(return_value=corpcode_response("<result></result>"))
+
+    assert client.get_corp_codes() == []
+    assert client.get_corp_codes() == []
+
+    assert client.session.get.call_count == 2